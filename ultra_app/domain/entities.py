@@ -1,25 +1,140 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from functools import cached_property
+from typing import Any, Callable, List, Optional, Sequence, Tuple
 import numpy as np
 from datetime import datetime
 
 
-@dataclass(frozen=True)
+def pad_list(values: Sequence, length: int, fill_factory: Callable[[], Any] = lambda: None) -> list:
+    """First `length` items of values, padded with fill_factory() up to `length`."""
+    out = list(values[:length])
+    out.extend(fill_factory() for _ in range(length - len(out)))
+    return out
+
+
+@dataclass(frozen=True, slots=True)
 class CaptureSlot:
     eye: str  # "Right" or "Left"
     index_in_eye: int  # 1..3
 
 
-@dataclass
+class FrameSlab:
+    """
+    One preallocated (capacity, H, W, C) frame array that several FrameStacks can
+    share. Allocated on the first ensure() call from that frame's shape/dtype, and
+    allocated again when a frame of another shape/dtype arrives while no slot is
+    filled (e.g. the camera reopened at a different resolution after an undo).
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.array: Optional[np.ndarray] = None
+        self.filled = 0  # slots in use, over all stacks sharing the slab
+
+    def ensure(self, frame: np.ndarray) -> np.ndarray:
+        array = self.array
+        if array is None or (self.filled == 0 and (frame.shape != array.shape[1:]
+                                                   or frame.dtype != array.dtype)):
+            self.array = np.empty((self.capacity,) + frame.shape, dtype=frame.dtype)
+        elif frame.shape != array.shape[1:]:
+            raise ValueError(f"Frame shape {frame.shape} does not match {array.shape[1:]}.")
+        return self.array
+
+
+class FrameStack:
+    """
+    Fixed-capacity stack of equally-shaped frames stored in one preallocated array.
+    The buffer is allocated on the first append (shape/dtype from that frame);
+    later appends copy into the next free slot. Supports len/indexing/iteration
+    like a list; view() returns the filled part as a single (n, H, W, C) array.
+    With slab/offset the stack owns slots offset..offset+capacity of a shared FrameSlab.
+    """
+
+    def __init__(self, capacity: int, slab: Optional[FrameSlab] = None, offset: int = 0):
+        self.capacity = capacity
+        self._slab = slab if slab is not None else FrameSlab(capacity)
+        self._offset = offset
+        self._count = 0
+
+    def append(self, frame: np.ndarray) -> None:
+        if self._count >= self.capacity:
+            raise IndexError(f"FrameStack is full ({self.capacity} frames).")
+        frame = np.asarray(frame)
+        self._slab.ensure(frame)[self._offset + self._count] = frame
+        self._count += 1
+        self._slab.filled += 1
+
+    def pop(self) -> np.ndarray:
+        if self._count == 0:
+            raise IndexError("pop from empty FrameStack")
+        self._count -= 1
+        self._slab.filled -= 1
+        return self._slab.array[self._offset + self._count].copy()
+
+    def __delitem__(self, item) -> None:
+        # only the top frame can go (undo); unlike pop() nothing is copied out
+        if self._count == 0 or item not in (-1, self._count - 1):
+            raise IndexError("FrameStack only supports deleting its last frame")
+        self._count -= 1
+        self._slab.filled -= 1
+
+    def view(self) -> np.ndarray:
+        """The filled frames as one array. It shares memory with the slab: a slot freed by
+        pop()/del is overwritten by the next append, so copy what must outlive an undo."""
+        if self._slab.array is None:
+            return np.empty((0,), dtype=np.uint8)
+        return self._slab.array[self._offset:self._offset + self._count]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, item):
+        return self.view()[item]
+
+    def __iter__(self):
+        return iter(self.view())
+
+
+@dataclass(slots=True)
 class OperationState:
     order: List[CaptureSlot]
     cursor: int = 0
-    images_right: List[np.ndarray] = field(default_factory=list)
-    images_left: List[np.ndarray] = field(default_factory=list)
+    images_right: Optional[FrameStack] = None
+    images_left: Optional[FrameStack] = None
+    _slab: Optional[FrameSlab] = field(default=None, init=False, repr=False, compare=False)
+    # len(order), stored once: the capture order is fixed for the state's lifetime
+    total: int = field(default=0, init=False, repr=False, compare=False)
+    # per slot: 0 = right eye, 1 = left eye; indexes (images_right, images_left)
+    eye_side: Tuple[int, ...] = field(default=(), init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.total = len(self.order)
+        self.eye_side = tuple(0 if s.eye == "Right" else 1 for s in self.order)
+        n_right = sum(1 for s in self.order if s.eye == "Right")
+        eyes_in_blocks = all(s.eye == "Right" for s in self.order[:n_right])
+        if self.images_right is None and self.images_left is None and eyes_in_blocks:
+            # Right slots then Left slots: both eyes share one slab, so frames is a view
+            self._slab = FrameSlab(self.total)
+            self.images_right = FrameStack(n_right, self._slab)
+            self.images_left = FrameStack(self.total - n_right, self._slab, offset=n_right)
+            return
+        # otherwise one preallocated slab per eye, sized from the capture order
+        if self.images_right is None:
+            self.images_right = FrameStack(n_right)
+        if self.images_left is None:
+            self.images_left = FrameStack(self.total - n_right)
 
     @property
-    def total(self) -> int:
-        return len(self.order)
+    def frames(self) -> np.ndarray:
+        """Captured frames, Right then Left, as one (n, H, W, C) array.
+        A view into the shared slab while the right eye is filled first; a copy otherwise."""
+        right, left = self.images_right, self.images_left
+        if self._slab is not None and (len(left) == 0 or len(right) == right.capacity):
+            if self._slab.array is None:
+                return np.empty((0,), dtype=np.uint8)
+            return self._slab.array[:len(right) + len(left)]
+        parts = [stack.view() for stack in (right, left) if len(stack)]
+        return np.concatenate(parts) if parts else np.empty((0,), dtype=np.uint8)
 
     def is_complete(self) -> bool:
         return self.cursor >= self.total
@@ -27,11 +142,15 @@ class OperationState:
     def current_slot(self) -> CaptureSlot:
         return self.order[self.cursor]
 
+    def stack_at(self, index: int) -> FrameStack:
+        """The eye's frame stack that slot `index` belongs to."""
+        return (self.images_right, self.images_left)[self.eye_side[index]]
+
     def advance(self) -> None:
         self.cursor += 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Measurement:
     """Domain entity representing a single measurement CSV row."""
     image_stem: Optional[str] = None
@@ -46,8 +165,7 @@ class Measurement:
     raw: dict = field(default_factory=dict)
 
     def as_dict(self) -> dict:
-        d = dict(self.raw)
-        d.update({
+        d = {
             "image_stem": self.image_stem,
             "status": self.status,
             "ond_px": self.ond_px,
@@ -57,61 +175,120 @@ class Measurement:
             "depth_mm": self.depth_mm,
             "latency_s": self.latency_s,
             "time": self.time,
-        })
-        return d
+        }
+        # raw source columns only exist when the loader was asked to keep them
+        return {**self.raw, **d} if self.raw else d
 
 
-@dataclass
+def float_values(values: Sequence, length: Optional[int] = None) -> np.ndarray:
+    """Float64 array of values (lists or numpy columns), NaN for None or non-numeric entries.
+    With length, the array is cut or NaN-padded to exactly that many entries."""
+    n = len(values) if length is None else min(len(values), length)
+    arr = np.fromiter(
+        (v if isinstance(v, (int, float, np.number)) else np.nan for v in values[:n]),
+        dtype=np.float64,
+        count=n,
+    )
+    if length is not None and n < length:
+        arr = np.concatenate((arr, np.full(length - n, np.nan)))
+    return arr
+
+
+def float_column(measurements: Sequence[Measurement], attr: str, length: Optional[int] = None) -> np.ndarray:
+    """Float64 column of one Measurement attribute, NaN where the value is missing.
+    With length, the column is cut or NaN-padded to exactly that many entries."""
+    return float_values([getattr(m, attr) for m in measurements[:length]], length)
+
+
+def nanmean_rounded(arr: np.ndarray) -> Optional[float]:
+    """Mean ignoring NaN, rounded to 2 decimals; None if no valid values."""
+    if arr.size == 0 or np.isnan(arr).all():
+        return None
+    return round(float(np.nanmean(arr)), 2)
+
+
+@dataclass(slots=True)
 class EyeMeasurements:
-    """Container for all measurements of a single eye (3 images)"""
+    """Container for all measurements of a single eye (3 images).
+    Value columns are built once on first access; measurements are not expected to change afterwards."""
     measurements: List[Measurement] = field(default_factory=list)
+    _onsd_arr: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _ond_arr: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def onsd_array(self) -> np.ndarray:
+        """Read-only float64 ONSD (mm) column, NaN where missing."""
+        if self._onsd_arr is None:
+            self._onsd_arr = float_column(self.measurements, "onsd_mm")
+            self._onsd_arr.flags.writeable = False
+        return self._onsd_arr
+
+    @property
+    def ond_array(self) -> np.ndarray:
+        """Read-only float64 OND (mm) column, NaN where missing."""
+        if self._ond_arr is None:
+            self._ond_arr = float_column(self.measurements, "ond_mm")
+            self._ond_arr.flags.writeable = False
+        return self._ond_arr
 
     @property
     def average_onsd_mm(self) -> Optional[float]:
-        valid_values = [m.onsd_mm for m in self.measurements if m.onsd_mm is not None]
-        if not valid_values:
-            return None
-        return round(sum(valid_values) / len(valid_values), 2)
+        return nanmean_rounded(self.onsd_array)
 
     @property
     def average_ond_mm(self) -> Optional[float]:
-        valid_values = [m.ond_mm for m in self.measurements if m.ond_mm is not None]
-        if not valid_values:
-            return None
-        return round(sum(valid_values) / len(valid_values), 2)
+        return nanmean_rounded(self.ond_array)
 
 
 @dataclass
 class PatientReport:
-    """Complete report data for a patient"""
+    """Complete report data for a patient.
+    Derived lists are computed once on first access; eyes are not expected to change afterwards."""
     patient_id: str
     timestamp: datetime = field(default_factory=datetime.now)
     right_eye: EyeMeasurements = field(default_factory=EyeMeasurements)
     left_eye: EyeMeasurements = field(default_factory=EyeMeasurements)
 
-    @property
+    @cached_property
     def all_measurements(self) -> List[Measurement]:
         """Returns all measurements in order: R1, R2, R3, L1, L2, L3"""
         return self.right_eye.measurements[:3] + self.left_eye.measurements[:3]
 
-    @property
+    @cached_property
     def onsd_values(self) -> List[Optional[float]]:
         return [m.onsd_mm for m in self.all_measurements]
 
-    @property
+    @cached_property
     def ond_values(self) -> List[Optional[float]]:
         return [m.ond_mm for m in self.all_measurements]
 
-    @property
+    @cached_property
+    def onsd_array(self) -> np.ndarray:
+        """Read-only float64 ONSD (mm) column R1..L3 (NaN where missing), joined from the eyes' cached columns."""
+        return self._joined_column(self.right_eye.onsd_array, self.left_eye.onsd_array)
+
+    @cached_property
+    def ond_array(self) -> np.ndarray:
+        """Read-only float64 OND (mm) column R1..L3 (NaN where missing)."""
+        return self._joined_column(self.right_eye.ond_array, self.left_eye.ond_array)
+
+    @staticmethod
+    def _joined_column(right: np.ndarray, left: np.ndarray) -> np.ndarray:
+        arr = np.concatenate((right[:3], left[:3]))
+        arr.flags.writeable = False
+        return arr
+
+    @cached_property
     def capture_times(self) -> List[Optional[str]]:
+        # a plain comprehension: for six cells an object-array mask is ~7x slower
         return [m.time or "—" for m in self.all_measurements]
 
-    @property
+    @cached_property
     def status_values(self) -> List[Optional[str]]:
         return [m.status or "—" for m in self.all_measurements]
 
 
-@dataclass
+@dataclass(slots=True)
 class ReportData:
     """Complete data needed to generate a report"""
     patient_report: PatientReport
@@ -120,8 +297,8 @@ class ReportData:
 
     def __post_init__(self):
         # Ensure we have exactly 3 images per eye
-        self.right_images = list(self.right_images[:3]) + [None] * max(0, 3 - len(self.right_images))
-        self.left_images = list(self.left_images[:3]) + [None] * max(0, 3 - len(self.left_images))
+        self.right_images = pad_list(self.right_images, 3)
+        self.left_images = pad_list(self.left_images, 3)
 
     @property
     def all_images(self) -> List[Optional[np.ndarray]]:
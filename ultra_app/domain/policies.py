@@ -9,9 +9,7 @@ class SixImagesPolicy:
                [CaptureSlot("Left",  i) for i in range(1, 4)]
 
     def store_image(self, state: OperationState, processed: np.ndarray) -> None:
-        slot = state.current_slot()
-        if slot.eye == "Right":
-            state.images_right.append(processed)
-        else:
-            state.images_left.append(processed)
+        # the copy into the stack's slab lays the frame out C-contiguously; asarray
+        # only converts (no copy for the processor's uint8 BGR output)
+        state.stack_at(state.cursor).append(np.asarray(processed, dtype=np.uint8))
         state.advance()
@@ -6,4 +6,4 @@ class ProcessorGateway(Protocol):
     def process(self, frame: np.ndarray) -> np.ndarray: ...
 
 class ReportWriterPort(Protocol):
-    def save_report(self, report_data: ReportData, out_dir: str) -> tuple[str, str]: ...
\ No newline at end of file
+    def save_report(self, report_data: ReportData, out_dir: str) -> tuple[Optional[str], Optional[str]]: ...
\ No newline at end of file
@@ -2,15 +2,17 @@
 from __future__ import annotations
 
 import sys
+import atexit
+import functools
 import time
+from collections import deque
 from typing import Optional, List
 import numpy as np
-import cv2
-from datetime import datetime
 import getpass
 import os
+import shiboken6
 
-from PySide6.QtCore import QTimer, Qt
+from PySide6.QtCore import QTimer, Qt, QEvent, QObject, QThread, Signal, Slot
 from PySide6.QtGui import QImage, QPixmap, QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
@@ -29,6 +31,11 @@ TEXT = "#e6ebf0"
 TEXT_DIM = "#a9b2bd"
 BORDER = "#2a2f3a"
 
+FRAME_INTERVAL_MS = 33  # ~30 FPS preview target
+FPS_BADGE_INTERVAL_S = 0.5  # how often the FPS badge text is refreshed
+# measurement log written by the ONSD pipeline; a relative path resolves against the cwd
+DEFAULT_MEASUREMENTS_CSV = os.path.join("Measurement Results", "measure_log.csv")
+
 
 def _apply_global_style(app: QApplication):
     app.setStyleSheet(f"""
@@ -73,15 +80,123 @@ def _apply_global_style(app: QApplication):
     """)
 
 
+# The QImage helpers wrap a contiguous ndarray without copying; the caller must
+# keep the array alive for as long as the QImage is used.
+def _bgr_to_qimage(frame: np.ndarray) -> QImage:
+    h, w = frame.shape[:2]
+    return QImage(frame.data, w, h, frame.strides[0], QImage.Format.Format_BGR888)
+
+
+def _gray_to_qimage(frame: np.ndarray) -> QImage:
+    h, w = frame.shape[:2]
+    return QImage(frame.data, w, h, frame.strides[0], QImage.Format.Format_Grayscale8)
+
+
+def _to_qimage(frame: np.ndarray) -> QImage:
+    return _gray_to_qimage(frame) if frame.ndim == 2 else _bgr_to_qimage(frame)
+
+
+def _preview_converter(processor) -> tuple:
+    """(expected ndim, converter) chosen once from the processor's declared output channels."""
+    if getattr(processor, "output_channels", 3) == 1:
+        return 2, _gray_to_qimage
+    return 3, _bgr_to_qimage
+
+
+class FrameWorker(QObject):
+    """
+    Live-preview pipeline running on its own QThread: camera read, processing,
+    QImage conversion and scaling to the preview size. The GUI thread only turns
+    the finished QImage into a QPixmap (pixmaps may not be created off the GUI thread).
+    """
+    frame_ready = Signal(object, object, object)  # (raw frame, processed frame, scaled QImage)
+    no_signal = Signal()
+
+    def __init__(self, camera: OpenCVCamera, controller: CaptureController):
+        super().__init__()
+        self.camera = camera
+        self.controller = controller
+        self.target_size = (640, 360)  # (w, h) of the preview label, updated by the GUI
+        self._convert_ndim, self._convert = _preview_converter(controller.processor)
+        self._timer: Optional[QTimer] = None
+
+    def grab(self) -> Optional[tuple]:
+        """Read, process and scale one frame. Returns None when the camera has no frame."""
+        frame = self.camera.read()
+        if frame is None:
+            return None
+        proc = np.ascontiguousarray(self.controller.process_only(frame))
+        w, h = self.target_size
+        # a processor that doesn't match its declared channels still gets a valid wrap
+        convert = self._convert if proc.ndim == self._convert_ndim else _to_qimage
+        # nearest-neighbour is plenty for a 30 FPS preview; review uses smooth scaling
+        qimg = convert(proc).scaled(w, h, Qt.KeepAspectRatio, Qt.FastTransformation)
+        return frame, proc, qimg
+
+    @Slot()
+    def start(self):
+        try:
+            self.camera.resume()
+        except RuntimeError:
+            self.no_signal.emit()  # device could not be reopened; camera.read() retries each tick
+        if self._timer is None:
+            # single-shot, re-armed after each frame so a slow processor never queues up timeouts
+            self._timer = QTimer(self)
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self._step)
+        self._timer.start(0)
+
+    @Slot()
+    def stop(self):
+        if self._timer is not None:
+            self._timer.stop()
+
+    @Slot()
+    def suspend(self):
+        """Stop and release the camera device; start() reopens it."""
+        self.stop()
+        self.camera.pause()
+
+    @Slot()
+    def _step(self):
+        t0 = time.perf_counter()
+        result = self.grab()
+        if result is None:
+            self.no_signal.emit()
+        else:
+            self.frame_ready.emit(*result)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        self._timer.start(max(0, FRAME_INTERVAL_MS - int(elapsed_ms)))
+
+
+def _shutdown_preview(thread: QThread, camera: OpenCVCamera) -> None:
+    """Quit and join the frame worker's thread, then release the camera. Safe to call again,
+    also from destroyed() during PySide's exit teardown, when the thread may already be gone."""
+    if shiboken6.isValid(thread) and thread.isRunning():
+        thread.quit()
+        thread.wait()
+        camera.release()
+
+
 class ULTRAWindow(QWidget):
+    # queued into the worker thread
+    _worker_start = Signal()
+    _worker_stop = Signal()
+    _worker_suspend = Signal()
+
     def __init__(self, controller: CaptureController, exporter: ExportReport,
-                 presenter: OperationPresenter, camera: OpenCVCamera):
+                 presenter: OperationPresenter, camera: OpenCVCamera,
+                 measurements_csv: str = DEFAULT_MEASUREMENTS_CSV):
         super().__init__()
         self.setWindowTitle("ULTRA Eye Scan – Clean Architecture")
+        # Qt objects must be destroyed on the GUI thread; left to Python's cyclic GC
+        # they could be freed from whichever thread (e.g. a frame worker) triggers it
+        self.setAttribute(Qt.WA_DeleteOnClose)
         self.controller = controller
         self.exporter = exporter
         self.presenter = presenter
         self.camera = camera
+        self.measurements_csv = measurements_csv
 
         # Header
         header = QHBoxLayout()
@@ -94,7 +209,7 @@ class ULTRAWindow(QWidget):
         self.badge_id.setObjectName("badge")
         self.badge_id.setMaximumWidth(180)
         self.badge_id.setAlignment(Qt.AlignCenter)
-        self.badge_date = QLabel(datetime.now().strftime("%Y-%m-%d"))
+        self.badge_date = QLabel(time.strftime("%Y-%m-%d"))
         self.badge_date.setObjectName("badge")
         self.badge_fps = QLabel("FPS: --")
         self.badge_fps.setObjectName("badge")
@@ -147,14 +262,35 @@ class ULTRAWindow(QWidget):
         # shortcuts
         QShortcut(QKeySequence("Space"), self, activated=self.on_capture)
 
-        # timer (video)
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.on_frame)
-        self.timer.start(30)  # ~33 FPS
+        # video: capture + processing on a worker thread
+        self._worker = FrameWorker(camera, controller)
+        # not a child of the window: it must outlive the widget until destroyed() has joined it
+        self._thread = QThread()
+        self._worker.moveToThread(self._thread)
+        self._worker.frame_ready.connect(self._on_frame_ready)
+        self._worker.no_signal.connect(self._on_no_signal)
+        self._worker_start.connect(self._worker.start)
+        self._worker_stop.connect(self._worker.stop)
+        self._worker_suspend.connect(self._worker.suspend)
+        # finished is emitted from the worker thread, so its timer is stopped in its own thread
+        self._thread.finished.connect(self._worker.stop, Qt.DirectConnection)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._thread.start()
+        # the window may be deleted, the app quit or the interpreter exit without a closeEvent;
+        # atexit handlers run before PySide's own teardown, which registered first
+        shutdown = functools.partial(_shutdown_preview, self._thread, camera)
+        self.destroyed.connect(shutdown)
+        QApplication.instance().aboutToQuit.connect(shutdown)
+        atexit.register(shutdown)
 
         self.current_frame: Optional[np.ndarray] = None
-        self._last_ts = time.time()
-        self._frames = 0
+        self.current_proc: Optional[np.ndarray] = None  # processed version of current_frame
+        # (source frame, target w, target h, scaled pixmap) of the last _scaled_pix call
+        self._last_scaled: Optional[tuple] = None
+        # FPS: moving average over the last ~1 s of frame periods
+        self._frame_periods: deque = deque(maxlen=30)
+        self._last_frame_t: Optional[float] = None
+        self._last_badge_update = 0.0
 
         self.captured_images: List[np.ndarray] = []
         self.capture_index = 0
@@ -188,60 +324,71 @@ class ULTRAWindow(QWidget):
 
     # ---------- Image helpers ----------
     def _cv_to_qpix(self, frame: np.ndarray) -> QPixmap:
-        if frame.ndim == 2:
-            rgb = cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)
-        else:
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb.shape
-        qimg = QImage(rgb.data, w, h, ch * w, QImage.Format.Format_RGB888)
-        return QPixmap.fromImage(qimg.copy())
+        # Wrap the ndarray directly (BGR888 / Grayscale8) instead of converting to RGB;
+        # fromImage() copies the pixels, so neither the array nor the QImage need outlive it.
+        return QPixmap.fromImage(_to_qimage(np.ascontiguousarray(frame)))
 
     def _scaled_pix(self, frame: np.ndarray, target: QLabel) -> QPixmap:
-        return self._cv_to_qpix(frame).scaled(
-            target.width(), target.height(),
-            Qt.KeepAspectRatio, Qt.SmoothTransformation
-        )
+        w, h = target.width(), target.height()
+        cached = self._last_scaled
+        if cached is not None and cached[0] is frame and cached[1:3] == (w, h):
+            return cached[3]
+        pix = self._cv_to_qpix(frame).scaled(w, h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self._last_scaled = (frame, w, h, pix)
+        return pix
+
+    # ---------- Video ----------
+    def _preview_visible(self) -> bool:
+        return self.isVisible() and not self.isMinimized()
+
+    def _set_preview_running(self, running: bool, release_camera: bool = False):
+        # release_camera: also free the device (hidden window); review only pauses the loop
+        if running and not self.in_review and self._preview_visible():
+            self._worker_start.emit()
+        elif release_camera:
+            self._worker_suspend.emit()
+        else:
+            self._worker_stop.emit()
+
+    def _on_no_signal(self):
+        self.badge_status.setText("NO SIGNAL")
 
-    # ---------- Timer ----------
-    def on_frame(self):
+    def _on_frame_ready(self, frame: np.ndarray, proc: np.ndarray, qimg: QImage):
         if self.in_review:
-            return
-        frame = self.camera.read()
-        if frame is None:
-            self.badge_status.setText("NO SIGNAL")
-            return
+            return  # queued before review mode started
         self.badge_status.setText("LIVE")
         self.current_frame = frame
-        proc = self.controller.process_only(frame)
-        self.seg_label.setPixmap(self._scaled_pix(proc, self.seg_label))
-
-        # FPS
-        self._frames += 1
-        now = time.time()
-        if now - self._last_ts >= 1.0:
-            fps = self._frames / (now - self._last_ts)
-            self.badge_fps.setText(f"FPS: {fps:.1f}")
-            self._frames = 0
-            self._last_ts = now
+        self.current_proc = proc
+        self.seg_label.setPixmap(QPixmap.fromImage(qimg))
+        self._worker.target_size = (self.seg_label.width(), self.seg_label.height())
+
+        # FPS; the label is only touched every FPS_BADGE_INTERVAL_S to avoid relayouts at frame rate
+        now = time.perf_counter()
+        if self._last_frame_t is not None:
+            self._frame_periods.append(now - self._last_frame_t)
+        self._last_frame_t = now
+        if now - self._last_badge_update >= FPS_BADGE_INTERVAL_S:
+            total = sum(self._frame_periods)
+            if total > 0:
+                self.badge_fps.setText(f"FPS: {len(self._frame_periods) / total:.1f}")
+                self._last_badge_update = now
 
     # ---------- Buttons ----------
     def on_capture(self):
-        if self.current_frame is None or self.in_review:
+        if self.current_proc is None or self.in_review:
             return
-        try:
-            proc = self.controller.process_only(self.current_frame)
-            self.review_image = proc.copy()
-            self.in_review = True
-            self.update_ui()
-        except Exception as e:
-            QMessageBox.warning(self, "Capture error", str(e))
+        # review the processed frame already on screen; processing it again here
+        # would run the processor on the GUI thread alongside the frame worker
+        self.review_image = self.current_proc.copy()
+        self.in_review = True
+        self.update_ui()
 
     def on_save(self):
         if self.current_frame is None:
             return
         try:
-            # Commit the capture to controller/state
-            self.controller.capture(self.current_frame)
+            # Commit the reviewed image; it was already processed in on_capture
+            self.controller.capture_precomputed(self.review_image)
 
             # Keep the processed image for thumbnails
             self.captured_images.append(self.review_image)
@@ -255,7 +402,7 @@ class ULTRAWindow(QWidget):
             self.onsd_values.append(onsd_value)
 
             # CAPTURE THE AULTRAUAL TIMESTAMP WHEN IMAGE IS SAVED
-            current_time = datetime.now().strftime('%H:%M:%S')
+            current_time = time.strftime("%H:%M:%S")
             self.capture_times.append(current_time)  # Use actual capture time
 
             self.capture_index += 1
@@ -269,8 +416,7 @@ class ULTRAWindow(QWidget):
                         patient_id = self.badge_id.text().strip()
 
                         # USE CAPTURED IMAGES FROM SCREEN + MEASUREMENTS FROM CSV + AULTRAUAL TIMESTAMPS
-                        images_dir = "Measurement Results"
-                        measurements_csv = os.path.join(images_dir, "measure_log.csv")
+                        measurements_csv = self.measurements_csv
 
                         if os.path.exists(measurements_csv):
                             # Use captured images with CSV measurements BUT AULTRAUAL CAPTURE TIMES
@@ -284,13 +430,14 @@ class ULTRAWindow(QWidget):
                                 capture_times=self.capture_times
                             )
 
+                            image_line = f"Image: {os.path.basename(png_path)}\n" if png_path else ""
                             QMessageBox.information(
                                 self, "Report Saved",
                                 f"Report saved successfully!\n"
                                 f"Images: Captured from screen\n"
                                 f"Measurements: Loaded from CSV\n"
                                 f"Timestamps: Actual capture times\n"
-                                f"Image: {os.path.basename(png_path)}\n"
+                                f"{image_line}"
                                 f"PDF: {os.path.basename(pdf_path)}"
                             )
                         else:
@@ -338,13 +485,13 @@ class ULTRAWindow(QWidget):
     # ---------- UI sync ----------
     def update_ui(self):
         if self.in_review:
-            self.timer.stop()
+            self._set_preview_running(False)
             self.seg_label.setPixmap(self._scaled_pix(self.review_image, self.seg_label))
             self.btn_capture.hide()
             self.btn_save.show()
             self.btn_delete.show()
         else:
-            self.timer.start(30)
+            self._set_preview_running(True)
             self.btn_capture.show()
             self.btn_save.hide()
             self.btn_delete.hide()
@@ -359,19 +506,35 @@ class ULTRAWindow(QWidget):
             self.btn_capture.setText(f"● Capture ({self.capture_index + 1}/6)  (Space)")
             self.btn_capture.setEnabled(True)
 
+    # ---------- Visibility ----------
+    def showEvent(self, e):
+        super().showEvent(e)
+        self._set_preview_running(True)  # the worker grabs its first frame right away
+
+    def hideEvent(self, e):
+        super().hideEvent(e)
+        self._set_preview_running(False, release_camera=True)
+
+    def changeEvent(self, e):
+        super().changeEvent(e)
+        if e.type() == QEvent.Type.WindowStateChange:
+            minimized = self.isMinimized()
+            self._set_preview_running(not minimized, release_camera=minimized)
+
     # ---------- Close ----------
     def closeEvent(self, e):
         try:
-            self.camera.release()
+            _shutdown_preview(self._thread, self.camera)
         finally:
             super().closeEvent(e)
 
 
 def run_gui(controller: CaptureController, exporter: ExportReport,
-            presenter: OperationPresenter, camera: OpenCVCamera):
+            presenter: OperationPresenter, camera: OpenCVCamera,
+            measurements_csv: str = DEFAULT_MEASUREMENTS_CSV):
     app = QApplication(sys.argv)
     _apply_global_style(app)
-    w = ULTRAWindow(controller, exporter, presenter, camera)
+    w = ULTRAWindow(controller, exporter, presenter, camera, measurements_csv=measurements_csv)
     w.resize(1380, 920)
     w.show()
     sys.exit(app.exec())
\ No newline at end of file
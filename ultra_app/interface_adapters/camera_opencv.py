@@ -1,19 +1,69 @@
+import time
+
 import cv2
 import numpy as np
 
 class OpenCVCamera:
-    def __init__(self, device_index: int = 0, width: int = 1280, height: int = 720):
-        self.cap = cv2.VideoCapture(device_index)
-        if width and height:
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH,  width)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-        if not self.cap.isOpened():
+    def __init__(self, device_index: int = 0, width: int = 1280, height: int = 720,
+                 max_drain: int = 3, drain_timeout_s: float = 0.005):
+        self.device_index = device_index
+        self.width = width
+        self.height = height
+        self.max_drain = max_drain
+        self.drain_timeout_s = drain_timeout_s
+        self._paused = False
+        self.cap = self._open()
+
+    def _open(self) -> cv2.VideoCapture:
+        cap = cv2.VideoCapture(self.device_index)
+        if self.width and self.height:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH,  self.width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        # keep the driver queue short so read() returns a live frame, not a stale one
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if not cap.isOpened():
             raise RuntimeError("Cannot open camera")
+        return cap
 
     def read(self) -> np.ndarray | None:
-        ok, frame = self.cap.read()
+        if self._paused:
+            return None
+        if self.cap is None:
+            # the reopen in resume() failed; keep retrying on every read
+            try:
+                self.cap = self._open()
+            except RuntimeError:
+                return None
+        # grab() without decoding until one blocks (= waited for a new frame) or
+        # max_drain buffered frames were skipped; then decode only the latest.
+        grabbed = False
+        for _ in range(1 + self.max_drain):
+            t0 = time.perf_counter()
+            if not self.cap.grab():
+                break
+            grabbed = True
+            if time.perf_counter() - t0 > self.drain_timeout_s:
+                break
+        if not grabbed:
+            return None
+        ok, frame = self.cap.retrieve()
         return frame if ok else None
 
+    def pause(self) -> None:
+        """Release the device (e.g. while the window is hidden); resume() reopens it."""
+        if not self._paused:
+            if self.cap:
+                self.cap.release()
+            self._paused = True
+
+    def resume(self) -> None:
+        """Reopen the device after pause(). If that fails, the error is raised and read()
+        retries the reopen (returning None) until it succeeds."""
+        if self._paused:
+            self._paused = False
+            self.cap = None
+            self.cap = self._open()
+
     def release(self) -> None:
         if self.cap:
-            self.cap.release()
\ No newline at end of file
+            self.cap.release()
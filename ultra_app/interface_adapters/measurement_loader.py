@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import csv
+import dataclasses
+import functools
+import itertools
 import os
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
-from ultra_app.domain.entities import Measurement, PatientReport, EyeMeasurements
+from ultra_app.domain.entities import Measurement, PatientReport, EyeMeasurements, pad_list
 
 
 def _normalize_col(name: str) -> str:
@@ -22,76 +25,123 @@ def _to_float(s: Optional[str]) -> Optional[float]:
         return None
 
 
+def _parse_floats(cells: List[Optional[str]]) -> List[Optional[float]]:
+    """Convert a column of cells with the builtin float() in one map() pass;
+    only a column holding a blank or malformed cell takes the per-cell _to_float path."""
+    try:
+        return list(map(float, cells))
+    except (TypeError, ValueError):
+        return list(map(_to_float, cells))
+
+
+# Measurement field -> normalized header candidates, and whether the column is numeric
+_COLUMN_CANDIDATES = (
+    ("image_stem", ("imagestem", "image", "filename"), False),
+    ("status", ("status",), False),
+    ("ond_px", ("ondpx", "ond_px", "ond"), True),
+    ("onsd_px", ("onsdpx", "onsd_px"), True),
+    ("ond_mm", ("ondmm", "ond_mm"), True),
+    ("onsd_mm", ("onsdmm", "onsd_mm", "onsd"), True),
+    ("depth_mm", ("depthmm", "depth_mm", "depth"), True),
+    ("latency_s", ("latencys", "latency_s", "latency"), True),
+    ("time", ("time", "capturetime", "timestamp"), False),
+)
+
+
+# Measurement's positional constructor order, without the trailing raw dict
+_FIELD_ORDER = tuple(f.name for f in dataclasses.fields(Measurement) if f.name != "raw")
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_columns(headers: Tuple[str, ...]) -> Tuple[Tuple[str, int, bool], ...]:
+    """Resolve CSV headers into (field, column index, numeric) triples.
+    Fields without a matching column are left out. Cached per header tuple,
+    so re-reading the same CSV layout skips the normalize/substring search."""
+    norm_map = {_normalize_col(h): i for i, h in enumerate(headers)}
+
+    def pick(cands) -> Optional[int]:
+        for c in cands:
+            if c in norm_map:
+                return norm_map[c]
+        # fallback: pick header that contains the candidate
+        for c in cands:
+            for nk, idx in norm_map.items():
+                if c in nk:
+                    return idx
+        return None
+
+    resolved = []
+    for name, cands, numeric in _COLUMN_CANDIDATES:
+        idx = pick(cands)
+        if idx is not None:
+            resolved.append((name, idx, numeric))
+    return tuple(resolved)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_cached(path: str, mtime_ns: int, size: int, max_rows: Optional[int],
+                 keep_raw: bool) -> Tuple[Tuple[Tuple[str, int, bool], ...], tuple, Optional[tuple]]:
+    """Parse the CSV into (resolved columns, per-row Measurement field tuples, raw rows).
+    Raw rows are (header, cell) pair tuples when keep_raw is set, else None. Only
+    immutable tuples are cached; load_measurements() builds new objects from them.
+    mtime_ns/size are only part of the cache key: a rewritten file gets a new entry."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        headers = next(reader, [])
+        columns = _resolve_columns(tuple(headers))
+
+        width = len(headers)
+        rows: List[list] = []
+        # blank lines are skipped like csv.DictReader does; with max_rows the
+        # file is only parsed up to the last row needed
+        nonblank = (row for row in reader if row)
+        for row in itertools.islice(nonblank, max_rows):
+            if len(row) < width:
+                row += [None] * (width - len(row))  # short row, as DictReader fills it
+            rows.append(row)
+
+    # convert column by column: one map() over each numeric column, then zip
+    # the columns back into rows; fields missing from the CSV stay None
+    by_field = {}
+    for name, idx, numeric in columns:
+        cells = [row[idx] for row in rows]
+        by_field[name] = _parse_floats(cells) if numeric else cells
+    absent = [None] * len(rows)
+    cols = [by_field.get(name, absent) for name in _FIELD_ORDER]
+    raw_rows = tuple(tuple(zip(headers, row)) for row in rows) if keep_raw else None
+    return columns, tuple(zip(*cols)), raw_rows
+
+
 class MeasurementLoader:
     def __init__(self, csv_path: str):
         self.csv_path = csv_path
-
-    def load_measurements(self, max_rows: Optional[int] = None) -> List[Measurement]:
-        """Load raw measurements from CSV"""
+        # (field, column index, numeric) triples resolved from the last header read
+        self.columns: Optional[Tuple[Tuple[str, int, bool], ...]] = None
+
+    def load_measurements(self, max_rows: Optional[int] = None, keep_raw: bool = False) -> List[Measurement]:
+        """Load raw measurements from CSV.
+        The source row is copied into Measurement.raw only when keep_raw is True.
+        Parsed rows are cached per (path, mtime, size, max_rows, keep_raw), so
+        re-exporting an unchanged CSV skips the parse; every call still returns
+        new Measurement objects (and raw dicts)."""
         if not os.path.isfile(self.csv_path):
             raise FileNotFoundError(self.csv_path)
 
-        with open(self.csv_path, newline="", encoding="utf-8") as fh:
-            reader = csv.DictReader(fh)
-            headers = reader.fieldnames or []
-            norm_map = {_normalize_col(h): h for h in headers}
-
-            def pick(*cands):
-                for c in cands:
-                    if c in norm_map:
-                        return norm_map[c]
-                # fallback: pick header that contains the candidate
-                for c in cands:
-                    for nk, orig in norm_map.items():
-                        if c in nk:
-                            return orig
-                return None
-
-            img_col = pick("imagestem", "image", "filename")
-            status_col = pick("status")
-            ondpx_col = pick("ondpx", "ond_px", "ond")
-            onsdpx_col = pick("onsdpx", "onsd_px")
-            ondmm_col = pick("ondmm", "ond_mm")
-            onsdmm_col = pick("onsdmm", "onsd_mm", "onsd")
-            depth_col = pick("depthmm", "depth_mm", "depth")
-            latency_col = pick("latencys", "latency_s", "latency")
-            time_col = pick("time", "capturetime", "timestamp")
-
-            out: List[Measurement] = []
-            for i, row in enumerate(reader):
-                if max_rows is not None and i >= max_rows:
-                    break
-
-                raw = dict(row)
-                m = Measurement(
-                    image_stem=row.get(img_col) if img_col else None,
-                    status=row.get(status_col) if status_col else None,
-                    ond_px=_to_float(row.get(ondpx_col)) if ondpx_col else None,
-                    onsd_px=_to_float(row.get(onsdpx_col)) if onsdpx_col else None,
-                    ond_mm=_to_float(row.get(ondmm_col)) if ondmm_col else None,
-                    onsd_mm=_to_float(row.get(onsdmm_col)) if onsdmm_col else None,
-                    depth_mm=_to_float(row.get(depth_col)) if depth_col else None,
-                    latency_s=_to_float(row.get(latency_col)) if latency_col else None,
-                    time=row.get(time_col) if time_col else None,
-                    raw=raw,
-                )
-                out.append(m)
-
-        return out
-
-    def load_patient_report(self, patient_id: str, max_rows: int = 6) -> PatientReport:
-        """Load measurements and organize into PatientReport dataclass"""
-        measurements = self.load_measurements(max_rows=max_rows)
+        path = os.path.abspath(self.csv_path)
+        st = os.stat(path)
+        self.columns, value_rows, raw_rows = _load_cached(path, st.st_mtime_ns, st.st_size, max_rows, keep_raw)
+        if raw_rows is None:
+            return [Measurement(*vals) for vals in value_rows]
+        return [Measurement(*vals, dict(raw)) for vals, raw in zip(value_rows, raw_rows)]
 
-        # Split into right and left eye measurements (first 3 are right, next 3 are left)
-        right_measurements = measurements[:3]
-        left_measurements = measurements[3:6]
+    def load_patient_report(self, patient_id: str, max_rows: int = 6, keep_raw: bool = False) -> PatientReport:
+        """Load measurements and organize into PatientReport dataclass"""
+        measurements = self.load_measurements(max_rows=max_rows, keep_raw=keep_raw)
 
-        # Pad with empty measurements if needed
-        while len(right_measurements) < 3:
-            right_measurements.append(Measurement())
-        while len(left_measurements) < 3:
-            left_measurements.append(Measurement())
+        # Split into right and left eye measurements (first 3 are right, next 3 are left),
+        # padded with empty measurements if needed
+        right_measurements = pad_list(measurements[:3], 3, Measurement)
+        left_measurements = pad_list(measurements[3:6], 3, Measurement)
 
         return PatientReport(
             patient_id=patient_id,
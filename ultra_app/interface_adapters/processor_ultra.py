@@ -7,9 +7,12 @@ class ULTRAProcessor(ProcessorGateway):
     Placeholder for your real ULTRA pipeline.
     Currently applies edge detection to simulate processing.
     """
+    output_channels = 3  # process() returns BGR frames
     def __init__(self):
         super().__init__()  # Call to the parent class constructor if needed
         self.last_onsd_value = None
+        # Warm up OpenCV (thread pool, kernel dispatch) so the first live frame isn't the slow one
+        self.process(np.zeros((64, 64, 3), dtype=np.uint8))
 
     def process_only(self, frame):
         # After processing, set last_onsd_value
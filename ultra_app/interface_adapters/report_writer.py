@@ -2,60 +2,122 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from io import BytesIO
+from itertools import accumulate
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
 
+from reportlab import rl_config
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import mm
 from reportlab.lib import colors
 from reportlab.lib.utils import ImageReader
 
+from ultra_app.domain.entities import float_values, nanmean_rounded
+
+try:  # optional: libjpeg-turbo encoder that returns bytes directly; cv2.imencode otherwise
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+# Resolution PDF thumbnails are downscaled to before JPEG encoding
+THUMB_DPI = 200
+
+# (w, h) of one cell in the 2x3 preview grid; frames are shrunk, not upsampled
+PREVIEW_CELL = (240, 320)
+PREVIEW_FORMATS = ("png", "jpg")
+REPORT_FORMATS = ("pdf",) + PREVIEW_FORMATS
+
+
+@contextmanager
+def _without_ascii85():
+    """
+    Thumbnails are embedded as-is (DCTDecode) and text streams are Flate-compressed;
+    the ASCII85 armour ReportLab adds on top only grows the file ~25% and is encoded
+    in pure Python when rl_accel is not installed. rl_config is process-wide, so it
+    is switched off only while our PDF is built and saved, then restored.
+    """
+    previous = rl_config.useA85
+    rl_config.useA85 = 0
+    try:
+        yield
+    finally:
+        rl_config.useA85 = previous
+
 
 class ReportWriter:
     """
-    Creates a single-page PDF + a PNG grid with real measurement data.
+    Creates a single-page PDF (+ an optional PNG grid) with real measurement data.
     Enhanced to show all measurement values from CSV.
     """
 
-    def __init__(self, threshold_mm: float = 6.0):
+    # (font, size) per text role; standard Type 1 fonts, nothing to register or embed
+    _FONTS = {
+        "title": ("Helvetica-Bold", 16),
+        "meta": ("Helvetica", 11),
+        "table_header": ("Helvetica-Bold", 9),
+        "table_cell": ("Helvetica", 8),
+        "summary": ("Helvetica-Bold", 12),
+        "column_title": ("Helvetica-Bold", 10),
+    }
+
+    # placeholder thumbnail JPEG, encoded once per quality setting
+    _BLANK_JPEG: Dict[int, bytes] = {}
+
+    def __init__(self, threshold_mm: float = 6.0, jpeg_quality: int = 85):
         self.threshold_mm = float(threshold_mm)
+        self.jpeg_quality = int(jpeg_quality)
 
     # ---------- public API ----------
     def save_report(
             self,
-            images_right: List[np.ndarray],
-            images_left: List[np.ndarray],
+            images_right: Sequence[np.ndarray],
+            images_left: Sequence[np.ndarray],
             out_dir: str,
-            onsd_values: Optional[List[Optional[float]]] = None,
+            onsd_values: Optional[Sequence[Optional[float]]] = None,
             capture_times: Optional[List[str]] = None,
             patient_id: Optional[str] = None,
             # Additional measurement data
-            ond_values: Optional[List[Optional[float]]] = None,
-            onsd_px_values: Optional[List[Optional[float]]] = None,
-            ond_px_values: Optional[List[Optional[float]]] = None,
-            depth_values: Optional[List[Optional[float]]] = None,
-            latency_values: Optional[List[Optional[float]]] = None,
+            ond_values: Optional[Sequence[Optional[float]]] = None,
+            onsd_px_values: Optional[Sequence[Optional[float]]] = None,
+            ond_px_values: Optional[Sequence[Optional[float]]] = None,
+            depth_values: Optional[Sequence[Optional[float]]] = None,
+            latency_values: Optional[Sequence[Optional[float]]] = None,
             status_values: Optional[List[Optional[str]]] = None,
-    ) -> Tuple[str, str]:
+            formats: Sequence[str] = ("pdf",),
+    ) -> Tuple[Optional[str], Optional[str]]:
         """
-        Returns (png_path, pdf_path)
+        Returns (png_path, pdf_path); each is None unless its format is requested.
+        formats holds "pdf" and/or one preview grid file type ("png" or "jpg");
+        a preview-only call skips building the PDF.
+        images_right/images_left may be lists, FrameStacks or (n, H, W, C) arrays.
+        Numeric values may be lists or float arrays; None and NaN both mean "missing".
         """
+        previews = [f for f in PREVIEW_FORMATS if f in formats]
+        if not formats or len(previews) > 1 or not set(formats) <= set(REPORT_FORMATS):
+            raise ValueError(f"formats must be 'pdf' and/or one of {PREVIEW_FORMATS}, got {formats!r}")
         os.makedirs(out_dir, exist_ok=True)
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_dt = datetime.now()  # one timestamp for the file name and the "Date:" line
+        ts = report_dt.strftime("%Y%m%d_%H%M%S")
         base_name = f"report_{ts}"
-        pdf_path = os.path.join(out_dir, f"{base_name}.pdf")
-        png_path = os.path.join(out_dir, f"{base_name}.png")
+        pdf_path = os.path.join(out_dir, f"{base_name}.pdf") if "pdf" in formats else None
+        png_path = os.path.join(out_dir, f"{base_name}.{previews[0]}") if previews else None
 
-        # Normalize lists
+        # Normalize lists (iterating a frame array yields per-frame views, not copies)
         right = list(images_right[:3]) + [None] * max(0, 3 - len(images_right))
         left = list(images_left[:3]) + [None] * max(0, 3 - len(images_left))
         imgs_all = right + left  # [R1,R2,R3,L1,L2,L3]
 
+        if pdf_path is None:
+            self._write_preview_grid(png_path, right, left)
+            return (png_path, None)
+
         # Normalize all measurement data
         if onsd_values is None:
             onsd_values = [None] * 6
@@ -76,35 +138,45 @@ class ReportWriter:
         status_values = self._normalize_list(status_values, 6, default="—")
 
         # Compute averages ignoring None
-        r_vals = [v for v in onsd_values[:3] if v is not None]
-        l_vals = [v for v in onsd_values[3:] if v is not None]
-        right_avg = round(sum(r_vals) / len(r_vals), 2) if r_vals else None
-        left_avg = round(sum(l_vals) / len(l_vals), 2) if l_vals else None
-
-        # Build SINGLE-PAGE PDF with enhanced data
-        self._build_pdf_single_page(
-            pdf_path=pdf_path,
-            patient_id=patient_id,
-            imgs_all=imgs_all,
-            onsd_values=onsd_values,
-            capture_times=capture_times,
-            right_avg=right_avg,
-            left_avg=left_avg,
-            # Pass additional data
-            ond_values=ond_values,
-            onsd_px_values=onsd_px_values,
-            ond_px_values=ond_px_values,
-            depth_values=depth_values,
-            latency_values=latency_values,
-            status_values=status_values,
-        )
-
-        # Build PNG grid (for convenience / preview)
-        grid = self._build_png_grid(right, left)
-        cv2.imwrite(png_path, grid)
+        onsd_arr = float_values(onsd_values)
+        right_avg = nanmean_rounded(onsd_arr[:3])
+        left_avg = nanmean_rounded(onsd_arr[3:])
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # PNG grid (for convenience / preview) is encoded while the PDF is built
+            png_job = pool.submit(self._write_preview_grid, png_path, right, left) if png_path else None
+
+            # Build SINGLE-PAGE PDF with enhanced data
+            with _without_ascii85():
+                self._build_pdf_single_page(
+                    pdf_path=pdf_path,
+                    report_dt=report_dt,
+                    patient_id=patient_id,
+                    imgs_all=imgs_all,
+                    onsd_values=onsd_values,
+                    capture_times=capture_times,
+                    right_avg=right_avg,
+                    left_avg=left_avg,
+                    # Pass additional data
+                    ond_values=ond_values,
+                    onsd_px_values=onsd_px_values,
+                    ond_px_values=ond_px_values,
+                    depth_values=depth_values,
+                    latency_values=latency_values,
+                    status_values=status_values,
+                )
+            if png_job is not None:
+                png_job.result()
 
         return (png_path, pdf_path)
 
+    def warm_up(self) -> None:
+        """Pay the one-off first-export costs up front: PIL's image plugin
+        registry (loaded by the first ImageReader), the lazy numpy.char import
+        and the placeholder JPEG. Safe to run on a background thread."""
+        ImageReader(BytesIO(self._blank_jpeg())).getSize()
+        np.char.mod("%.2f", np.zeros(1))
+
     def _normalize_list(self, values, length: int, default=None):
         """Helper to normalize list to specified length."""
         if values is None:
@@ -112,18 +184,73 @@ class ReportWriter:
         return list(values[:length]) + [default] * max(0, length - len(values))
 
     # ---------- helpers ----------
-    def _np_to_imagereader(self, img: Optional[np.ndarray]) -> ImageReader:
-        """Convert numpy image (BGR or grayscale) to ImageReader via JPEG bytes."""
+    def _np_to_imagereader(self, img: Optional[np.ndarray],
+                           max_size: Optional[Tuple[int, int]] = None) -> ImageReader:
+        """Convert numpy image (BGR or grayscale) to ImageReader via JPEG bytes.
+
+        With max_size=(w, h) the image is first shrunk (aspect kept) to fit that box.
+        """
         if img is None:
+            return ImageReader(BytesIO(self._blank_jpeg()))
+        if max_size is not None:
+            h, w = img.shape[:2]
+            scale = min(max_size[0] / w, max_size[1] / h)
+            if scale < 1.0:
+                img = self._resize(img, (max(1, round(w * scale)), max(1, round(h * scale))))
+        return ImageReader(BytesIO(self._encode_jpeg(img)))
+
+    def _blank_jpeg(self) -> bytes:
+        data = self._BLANK_JPEG.get(self.jpeg_quality)
+        if data is None:
             # MAXIMIZED SIZE: Very large blank placeholder
             blank = np.full((300, 225, 3), 240, dtype=np.uint8)  # Increased to 300x225
-            ok, buf = cv2.imencode(".jpg", blank)
-        else:
-            img3 = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR) if img.ndim == 2 else img
-            ok, buf = cv2.imencode(".jpg", img3)
+            data = self._BLANK_JPEG[self.jpeg_quality] = self._encode_jpeg(blank)
+        return data
+
+    def _encode_jpeg(self, img: np.ndarray) -> bytes:
+        """JPEG bytes for a BGR or grayscale image: simplejpeg when installed, else cv2.imencode."""
+        if simplejpeg is not None:
+            if img.ndim == 2:
+                # single-component JPEG: no colour conversion, a third of the DCT work
+                return simplejpeg.encode_jpeg(
+                    np.ascontiguousarray(img)[..., None], quality=self.jpeg_quality, colorspace="GRAY",
+                )
+            # 4:2:0 matches cv2.imencode's default output
+            return simplejpeg.encode_jpeg(
+                np.ascontiguousarray(img), quality=self.jpeg_quality,
+                colorspace="BGR", colorsubsampling="420",
+            )
+        # 2-D input is written as a single-component JPEG, no BGR expansion needed
+        ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
         if not ok:
             raise RuntimeError("Failed to encode image for PDF.")
-        return ImageReader(BytesIO(buf.tobytes()))
+        # the only copy: BytesIO shares a bytes object's buffer, but would copy buf.data
+        return buf.tobytes()
+
+    def _encode_thumbs(self, imgs: List[Optional[np.ndarray]],
+                       max_size: Optional[Tuple[int, int]] = None) -> List[ImageReader]:
+        """JPEG-encode all thumbnails (R1..R3, L1..L3) in one pass before drawing.
+        Resize and encode release the GIL, so the images are done in parallel."""
+        workers = min(len(imgs), os.cpu_count() or 1)
+        if workers <= 1:
+            return [self._np_to_imagereader(img, max_size) for img in imgs]
+        if any(img is None for img in imgs):
+            self._blank_jpeg()  # fill the placeholder memo here, not racing in the workers
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda img: self._np_to_imagereader(img, max_size), imgs))
+
+    @staticmethod
+    def _resize(img: np.ndarray, size: Tuple[int, int],
+                dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """Resize to size=(w, h); INTER_AREA when shrinking, bilinear when enlarging."""
+        h, w = img.shape[:2]
+        interp = cv2.INTER_AREA if size[0] * size[1] < w * h else cv2.INTER_LINEAR
+        return cv2.resize(img, size, dst=dst, interpolation=interp)
+
+    @staticmethod
+    def _thumb_px(w_pt: float, h_pt: float) -> Tuple[int, int]:
+        """Pixel box of a w_pt x h_pt (PDF points) thumbnail at THUMB_DPI."""
+        return round(w_pt / 72 * THUMB_DPI), round(h_pt / 72 * THUMB_DPI)
 
     def _avg_color(self, val: Optional[float]):
         if val is None:
@@ -143,44 +270,49 @@ class ReportWriter:
         col_w = [12 * mm, 12 * mm, 20 * mm, 20 * mm, 20 * mm, 20 * mm, 20 * mm, 20 * mm]  # Reduced column widths
         row_h = 5 * mm  # Reduced row height from 7mm to 5mm
 
+        # text x per column (1mm cell padding) and baseline y per line (header + rows)
+        xs = list(accumulate(col_w[:-1], initial=start_x + 1 * mm))
+        ys = [start_y - k * row_h for k in range(len(rows) + 1)]
+
+        # one text object (single BT..ET block) for the whole table
+        t = c.beginText()
+
         # headers
-        c.setFont("Helvetica-Bold", 9)
-        x = start_x
-        y = start_y
-        for i, h in enumerate(headers):
-            c.drawString(x + 1 * mm, y, h)
-            x += col_w[i]
+        t.setFont(*self._FONTS["table_header"])
+        for x, h in zip(xs, headers):
+            t.setTextOrigin(x, ys[0])
+            t.textOut(h)
 
         # rows
-        c.setFont("Helvetica", 8)
-        y -= row_h
-        for r in rows:
-            x = start_x
-            for i, cell in enumerate(r):
-                c.drawString(x + 1 * mm, y, str(cell))
-                x += col_w[i]
-            y -= row_h
+        t.setFont(*self._FONTS["table_cell"])
+        for y, r in zip(ys[1:], rows):
+            for x, cell in zip(xs, r):
+                t.setTextOrigin(x, y)
+                t.textOut(str(cell))
 
-        return y
+        c.drawText(t)
+        return ys[-1] - row_h
 
     def _build_pdf_single_page(
             self,
             pdf_path: str,
             patient_id: Optional[str],
             imgs_all: List[Optional[np.ndarray]],
-            onsd_values: List[Optional[float]],
+            onsd_values: Sequence[Optional[float]],
             capture_times: List[str],
             right_avg: Optional[float],
             left_avg: Optional[float],
             # Additional data
-            ond_values: List[Optional[float]],
-            onsd_px_values: List[Optional[float]],
-            ond_px_values: List[Optional[float]],
-            depth_values: List[Optional[float]],
-            latency_values: List[Optional[float]],
+            ond_values: Sequence[Optional[float]],
+            onsd_px_values: Sequence[Optional[float]],
+            ond_px_values: Sequence[Optional[float]],
+            depth_values: Sequence[Optional[float]],
+            latency_values: Sequence[Optional[float]],
             status_values: List[Optional[str]],
+            report_dt: Optional[datetime] = None,
     ):
-        c = canvas.Canvas(pdf_path, pagesize=A4)
+        report_dt = report_dt or datetime.now()
+        c = canvas.Canvas(pdf_path, pagesize=A4, pageCompression=1)
         W, H = A4
         margin = 15 * mm
         inner_w = W - 2 * margin
@@ -188,37 +320,35 @@ class ReportWriter:
         y = H - margin
 
         # Title
-        c.setFont("Helvetica-Bold", 16)
+        c.setFont(*self._FONTS["title"])
         c.drawString(margin, y, "Report: Automated ONSD Measurement")
         y -= 8 * mm
 
         # Meta row: Patient ID + Date
-        c.setFont("Helvetica", 11)
+        c.setFont(*self._FONTS["meta"])
         pid = (patient_id or "N/A")
         c.drawString(margin, y, f"Patient ID: {pid}")
-        c.drawRightString(W - margin, y, f"Date: {datetime.now().strftime('%d.%m.%Y')}")
+        c.drawRightString(W - margin, y, f"Date: {report_dt.strftime('%d.%m.%Y')}")
         y -= 10 * mm
 
         # Enhanced table rows (1..6) — RRR then LLL with all measurement data
-        rows = []
-        for i in range(6):
-            eye = "R" if i < 3 else "L"
-            img_num = str(i + 1)
-            status = status_values[i] or "—"
-            onsd_mm = f"{onsd_values[i]:.2f}" if isinstance(onsd_values[i], (int, float)) else "—"
-            ond_mm = f"{ond_values[i]:.2f}" if isinstance(ond_values[i], (int, float)) else "—"
-            onsd_px = f"{onsd_px_values[i]:.0f}" if isinstance(onsd_px_values[i], (int, float)) else "—"
-            depth = f"{depth_values[i]:.2f}" if isinstance(depth_values[i], (int, float)) else "—"
-            time_val = capture_times[i] if i < len(capture_times) else "—"
-
-            rows.append((img_num, eye, status, onsd_mm, ond_mm, onsd_px, depth, time_val))
+        # numeric columns (ONSD, OND, ONSD px, depth) as one NaN-padded block,
+        # formatted in one call; missing values become "—"
+        num_cols = np.stack([float_values(v) for v in (onsd_values, ond_values, onsd_px_values, depth_values)])
+        num_fmts = np.array(["%.2f", "%.2f", "%.0f", "%.2f"])[:, None]
+        cells = np.where(np.isnan(num_cols), "—", np.char.mod(num_fmts, num_cols)).tolist()
+        img_nums = [str(i + 1) for i in range(6)]
+        eyes = ["R"] * 3 + ["L"] * 3
+        statuses = [v or "—" for v in status_values[:6]]
+        times = list(capture_times[:6]) + ["—"] * max(0, 6 - len(capture_times))
+        rows = list(zip(img_nums, eyes, statuses, *cells, times))
 
         # Draw the enhanced table
         y = self._draw_enhanced_table_and_return_y(c, start_x=margin, start_y=y, rows=rows)
         y -= 3 * mm  # small gap
 
         # Averages (color-coded)
-        c.setFont("Helvetica-Bold", 12)
+        c.setFont(*self._FONTS["summary"])
         c.drawString(margin, y, "ONSD Averages:")
         # Right
         c.setFillColor(self._avg_color(right_avg))
@@ -237,7 +367,7 @@ class ReportWriter:
         def is_normal(v: Optional[float]) -> bool:
             return v is not None and v <= self.threshold_mm
 
-        c.setFont("Helvetica-Bold", 12)
+        c.setFont(*self._FONTS["summary"])
         if (right_avg is not None and left_avg is not None) and (is_normal(right_avg) and is_normal(left_avg)):
             c.setFillColor(colors.green)
             c.drawString(margin, y, "✓ Normal finding. No indications of increased intracranial pressure.")
@@ -273,62 +403,51 @@ class ReportWriter:
         col_x1 = start_x + thumb_w + h_spacing
 
         # Column titles - centered and closer to images
-        c.setFont("Helvetica-Bold", 10)
+        c.setFont(*self._FONTS["column_title"])
         c.drawString(col_x0, y, "Right Eye (R)")
         c.drawString(col_x1, y, "Left Eye (L)")
         y -= 4 * mm  # Minimal space between title and images
 
+        readers = self._encode_thumbs(imgs_all, max_size=self._thumb_px(thumb_w, thumb_h))
+
         # Draw Right column (0..2)
         yy = y
         for i in range(3):
-            reader = self._np_to_imagereader(imgs_all[i])
-            c.drawImage(reader, col_x0, yy - thumb_h, thumb_w, thumb_h, preserveAspectRatio=True, anchor='nw')
+            c.drawImage(readers[i], col_x0, yy - thumb_h, thumb_w, thumb_h, preserveAspectRatio=True, anchor='nw')
             yy -= (thumb_h + v_spacing)
 
         # Draw Left column (3..5)
         yy = y
         for i in range(3, 6):
-            reader = self._np_to_imagereader(imgs_all[i])
-            c.drawImage(reader, col_x1, yy - thumb_h, thumb_w, thumb_h, preserveAspectRatio=True, anchor='nw')
+            c.drawImage(readers[i], col_x1, yy - thumb_h, thumb_w, thumb_h, preserveAspectRatio=True, anchor='nw')
             yy -= (thumb_h + v_spacing)
 
         # Finish the single page
         c.save()
 
+    def _write_preview_grid(self, path: str, right: List[Optional[np.ndarray]],
+                            left: List[Optional[np.ndarray]]) -> None:
+        grid = self._build_png_grid(right, left)
+        if path.endswith(".jpg"):
+            with open(path, "wb") as f:
+                f.write(self._encode_jpeg(grid))
+        # low DEFLATE level: much faster, and the grid is only a preview
+        elif not cv2.imwrite(path, grid, [cv2.IMWRITE_PNG_COMPRESSION, 1]):
+            raise RuntimeError("Failed to write PNG preview.")
+
     def _build_png_grid(self, right: List[Optional[np.ndarray]], left: List[Optional[np.ndarray]]) -> np.ndarray:
         """Build a simple 2x3 grid PNG (Right column + Left column)."""
-
-        def as_color(img):
-            if img is None:
-                # MAXIMIZED SIZE: Very large placeholder images
-                return np.full((600, 450, 3), 240, dtype=np.uint8)  # Increased to 600x450
-            # Resize image to fit in grid - MAXIMIZED SIZE
-            return cv2.resize(img, (450, 600))  # Increased to 450x600
-
-        # Create 3x2 grid (3 rows, 2 columns)
-        grid_rows = []
-        for i in range(3):
-            row_imgs = []
-            # Right eye image
-            if i < len(right) and right[i] is not None:
-                row_imgs.append(as_color(right[i]))
-            else:
-                row_imgs.append(as_color(None))
-
-            # Left eye image  
-            if i < len(left) and left[i] is not None:
-                row_imgs.append(as_color(left[i]))
-            else:
-                row_imgs.append(as_color(None))
-
-            # Concatenate horizontally with minimal spacing
-            row = np.hstack(row_imgs)
-            grid_rows.append(row)
-
-        # Concatenate vertically with minimal spacing
-        if grid_rows:
-            grid = np.vstack(grid_rows)
-        else:
-            grid = as_color(None)
-
-        return grid
\ No newline at end of file
+        # cells are resized straight into one preallocated buffer;
+        # empty slots keep the light-gray fill
+        cw, ch = PREVIEW_CELL
+        grid = np.full((3 * ch, 2 * cw, 3), 240, dtype=np.uint8)
+        for col, imgs in enumerate((right, left)):
+            for row, img in enumerate(imgs[:3]):
+                if img is None:
+                    continue
+                cell = grid[row * ch:(row + 1) * ch, col * cw:(col + 1) * cw]
+                if img.ndim == 2:
+                    cv2.cvtColor(self._resize(img, (cw, ch)), cv2.COLOR_GRAY2BGR, dst=cell)
+                else:
+                    self._resize(img, (cw, ch), dst=cell)
+        return grid
@@ -1,36 +1,47 @@
 # ultra_app/main.py
 
-from ultra_app.interface_adapters.processor_ultra import ULTRAProcessor
-from ultra_app.interface_adapters.report_writer import ReportWriter
-from ultra_app.interface_adapters.presenter import OperationPresenter
-from ultra_app.interface_adapters.camera_opencv import OpenCVCamera
+import os
 
-from ultra_app.domain.policies import SixImagesPolicy
+# resolve app data next to this file instead of changing the process cwd
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MEASUREMENTS_CSV = os.path.join(BASE_DIR, "Measurement Results", "measure_log.csv")
 
-from ultra_app.use_cases.capture_controller import CaptureController
-from ultra_app.use_cases.export_report import ExportReport
 
-from ultra_app.frameworks.gui_qt import run_gui
-import sys, os
-os.chdir(os.path.dirname(os.path.abspath(__file__)))
+def main() -> None:
+    import threading
 
+    # imported here so that importing this module doesn't load cv2 / reportlab / PySide6
+    from ultra_app.interface_adapters.processor_ultra import ULTRAProcessor
+    from ultra_app.interface_adapters.report_writer import ReportWriter
+    from ultra_app.interface_adapters.presenter import OperationPresenter
+    from ultra_app.interface_adapters.camera_opencv import OpenCVCamera
+
+    from ultra_app.domain.policies import SixImagesPolicy
+
+    from ultra_app.use_cases.capture_controller import CaptureController
+    from ultra_app.use_cases.export_report import ExportReport
 
-def main() -> None:
     processor = ULTRAProcessor()
     policy = SixImagesPolicy()
     controller = CaptureController(processor, policy)
 
     writer = ReportWriter()
+    # first-export costs are paid while the camera and GUI start, not on the export click
+    threading.Thread(target=writer.warm_up, name="report-warm-up", daemon=True).start()
     exporter = ExportReport(writer)
 
     presenter = OperationPresenter()
     camera = OpenCVCamera(device_index=0, width=1280, height=720)
 
+    # the GUI (PySide6) is only loaded once the camera has opened
+    from ultra_app.frameworks.gui_qt import run_gui
+
     run_gui(
         controller=controller,
         exporter=exporter,
         presenter=presenter,
         camera=camera,
+        measurements_csv=MEASUREMENTS_CSV,
     )
 
 
@@ -5,49 +5,50 @@ Test runner for ULTRA Eye Scan application
 import sys
 import subprocess
 import argparse
+import importlib.util
 import os
 
 
-def run_unit_tests():
-    """Run unit tests with coverage"""
+COVERAGE_ARGS = [
+    '-p', 'pytest_cov',
+    '--cov=ultra_app',
+    '--cov-report=term-missing',
+    '--cov-report=html',
+]
+# fast local loop: stop at the first failure, don't write .pytest_cache
+QUICK_ARGS = ['-x', '-p', 'no:cacheprovider']
+
+
+def _parallel_args():
+    """Spread tests over all cores with pytest-xdist when it is installed."""
+    return ['-n', 'auto'] if importlib.util.find_spec('xdist') else []
+
+
+def _run_pytest(path, coverage=False, parallel=False):
+    """Run pytest on path; coverage tracing slows the run and is opt-in."""
+    args = [sys.executable, '-m', 'pytest', path, '-v']
+    args += COVERAGE_ARGS if coverage else QUICK_ARGS
+    if parallel:
+        args += _parallel_args()
+    return subprocess.run(args).returncode
+
+
+def run_unit_tests(coverage=False):
+    """Run unit tests"""
     print("Running unit tests...")
-    result = subprocess.run([
-        sys.executable, '-m', 'pytest',
-        '-p', 'pytest_cov',
-        'ultra_app/tests/unit/',
-        '-v', 
-        '--cov=ultra_app',
-        '--cov-report=term-missing',
-        '--cov-report=html'
-    ])
-    return result.returncode
-
-
-def run_integration_tests():
+    return _run_pytest('ultra_app/tests/unit/', coverage)
+
+
+def run_integration_tests(coverage=False):
     """Run integration tests"""
     print("Running integration tests...")
-    result = subprocess.run([
-        sys.executable, '-m', 'pytest',
-        '-p', 'pytest_cov',
-        'ultra_app/tests/integration/',  # Fixed path
-        '-v'
-    ])
-    return result.returncode
+    return _run_pytest('ultra_app/tests/integration/', coverage, parallel=True)
 
 
-def run_all_tests():
+def run_all_tests(coverage=False):
     """Run all tests"""
     print("Running all tests...")
-    result = subprocess.run([
-        sys.executable, '-m', 'pytest',
-        '-p', 'pytest_cov',
-        'ultra_app/tests/',  # Fixed path
-        '-v',
-        '--cov=ultra_app',
-        '--cov-report=term-missing',
-        '--cov-report=html'
-    ])
-    return result.returncode
+    return _run_pytest('ultra_app/tests/', coverage, parallel=True)
 
 
 def main():
@@ -55,15 +56,17 @@ def main():
     parser.add_argument('--unit', action='store_true', help='Run only unit tests')
     parser.add_argument('--integration', action='store_true', help='Run only integration tests')
     parser.add_argument('--all', action='store_true', help='Run all tests (default)')
+    parser.add_argument('--coverage', action='store_true',
+                        help='Collect coverage with pytest-cov (slower; use for CI)')
     
     args = parser.parse_args()
     
     if args.unit:
-        return run_unit_tests()
+        return run_unit_tests(args.coverage)
     elif args.integration:
-        return run_integration_tests()
+        return run_integration_tests(args.coverage)
     else:
-        return run_all_tests()
+        return run_all_tests(args.coverage)
 
 
 if __name__ == '__main__':
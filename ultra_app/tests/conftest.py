@@ -12,6 +12,16 @@ from ultra_app.domain.entities import CaptureSlot, OperationState, Measurement,
 from ultra_app.domain.policies import SixImagesPolicy
 from ultra_app.domain.ports import ProcessorGateway, ReportWriterPort
 
+# one mid-gray 480p BGR frame shared by the fixtures below instead of fresh random
+# data per test; tests that modify a frame should .copy() it first
+_SHARED_FRAME = np.full((480, 640, 3), 128, dtype=np.uint8)
+
+
+@pytest.fixture(scope="session")
+def frame_480p():
+    """The shared 480p frame, for tests whose pixel content doesn't matter."""
+    return _SHARED_FRAME
+
 
 @pytest.fixture
 def sample_capture_slots():
@@ -82,7 +92,7 @@ def sample_patient_report():
 @pytest.fixture
 def mock_processor():
     processor = Mock(spec=ProcessorGateway)
-    processor.process.return_value = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    processor.process.return_value = _SHARED_FRAME
     return processor
 
 
@@ -95,4 +105,4 @@ def mock_report_writer():
 
 @pytest.fixture
 def sample_images():
-    return [np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(6)]
\ No newline at end of file
+    return [_SHARED_FRAME] * 6
\ No newline at end of file
@@ -4,6 +4,7 @@ import os
 import cv2
 import numpy as np
 import time
+import threading
 from unittest.mock import Mock, patch
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt, QTimer
@@ -22,6 +23,17 @@ from ultra_app.interface_adapters.presenter import OperationPresenter
 from ultra_app.interface_adapters.camera_opencv import OpenCVCamera
 
 
+def process_events_until(qapp, predicate, timeout_s=2.0):
+    """Pump the GUI event loop until predicate() holds; frames arrive queued from the worker."""
+    deadline = time.perf_counter() + timeout_s
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        qapp.processEvents()
+        time.sleep(0.005)
+    return True
+
+
 class TestGUIIntegration:
     """Integration tests for the GUI components"""
     
@@ -73,7 +85,7 @@ class TestGUIIntegration:
         )
         
         window.show()
-        qapp.processEvents()  # Process initial events
+        assert process_events_until(qapp, lambda: window.current_proc is not None)  # first frame
         
         yield window
         
@@ -114,6 +126,20 @@ class TestGUIIntegration:
         assert len(gui_window.onsd_values) == 1
         assert len(gui_window.capture_times) == 1
     
+    def test_capture_reviews_displayed_frame(self, gui_window, mock_dependencies):
+        """Capture reuses the worker's processed frame instead of processing again"""
+        mock_processor, _, _ = mock_dependencies
+        gui_thread = threading.get_ident()
+        callers = []
+        frame = mock_processor.process.return_value
+        mock_processor.process.side_effect = lambda _: callers.append(threading.get_ident()) or frame
+
+        gui_window.on_capture()
+
+        assert gui_thread not in callers  # the frame worker may still be running
+        assert gui_window.review_image is not gui_window.current_proc
+        assert np.array_equal(gui_window.review_image, gui_window.current_proc)
+    
     def test_capture_delete_flow(self, gui_window):
         """Test capture and delete flow"""
         # Simulate capture
@@ -182,6 +208,7 @@ class TestGUIIntegration:
                 # Set up current frame
                 test_frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
                 gui_window.current_frame = test_frame
+                gui_window.current_proc = test_frame
                 mock_processor.process.return_value = test_frame
 
                 # Simulate capture
@@ -216,7 +243,56 @@ class TestGUIIntegration:
                     assert len(gui_window.capture_times) == 0
                     assert not gui_window.in_review
     
-    def test_frame_processing(self, gui_window, mock_dependencies):
+    def test_review_pixmap_scaling_is_cached(self, gui_window):
+        """Redrawing the same review image at the same size reuses the scaled pixmap"""
+        frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+        first = gui_window._scaled_pix(frame, gui_window.seg_label)
+        second = gui_window._scaled_pix(frame, gui_window.seg_label)
+        assert second is first
+
+        other = gui_window._scaled_pix(frame.copy(), gui_window.seg_label)
+        assert other is not first
+    
+    def test_camera_released_while_hidden(self, gui_window, mock_dependencies):
+        """Hiding the window releases the camera device; showing it again reopens it"""
+        mock_processor, mock_camera, mock_exporter = mock_dependencies
+        
+        def wait_for(mock_method):
+            # the camera is driven from the worker thread
+            for _ in range(100):
+                if mock_method.called:
+                    return True
+                time.sleep(0.01)
+            return False
+        
+        gui_window.hide()
+        assert wait_for(mock_camera.pause)
+        
+        mock_camera.resume.reset_mock()
+        gui_window.show()
+        assert wait_for(mock_camera.resume)
+    
+    def test_worker_stopped_when_deleted_without_close(self, qapp, mock_dependencies):
+        """Deleting the window without closing it still joins the worker thread"""
+        import shiboken6
+        from ultra_app.domain.policies import SixImagesPolicy
+        mock_processor, mock_camera, mock_exporter = mock_dependencies
+        window = ULTRAWindow(
+            controller=CaptureController(mock_processor, SixImagesPolicy()),
+            exporter=mock_exporter,
+            presenter=OperationPresenter(),
+            camera=mock_camera
+        )
+        window.show()
+        assert process_events_until(qapp, lambda: window.current_proc is not None)
+        thread = window._thread
+        
+        shiboken6.delete(window)
+        
+        assert not thread.isRunning()
+        mock_camera.release.assert_called_once()
+    
+    def test_frame_processing(self, qapp, gui_window, mock_dependencies):
         """Test that frames are processed correctly in the GUI"""
         mock_processor, mock_camera, mock_exporter = mock_dependencies
         
@@ -224,14 +300,15 @@ class TestGUIIntegration:
         test_frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
         mock_camera.read.return_value = test_frame
         
-        # Simulate frame processing
-        gui_window.on_frame()
+        # The worker thread reads and processes it; the GUI shows the result
+        assert process_events_until(qapp, lambda: gui_window.current_frame is test_frame)
         
         # Verify camera was read and processor was called
         mock_camera.read.assert_called()
         mock_processor.process.assert_called_with(test_frame)
+        assert gui_window.current_proc is not None
     
-    def test_fps_calculation(self, gui_window, mock_dependencies):
+    def test_fps_calculation(self, qapp, gui_window, mock_dependencies):
         """Test FPS calculation in the GUI"""
         mock_processor, mock_camera, mock_exporter = mock_dependencies
         
@@ -240,12 +317,12 @@ class TestGUIIntegration:
         mock_camera.read.return_value = test_frame
         
         # Reset FPS calculation state
-        gui_window._frames = 0
-        gui_window._last_ts = time.time() - 1.1  # Force FPS calculation
+        gui_window._frame_periods.clear()
+        gui_window._last_frame_t = None
+        gui_window._last_badge_update = 0.0  # Force FPS calculation
         
-        # Process multiple frames to trigger FPS calculation
-        for i in range(15):
-            gui_window.on_frame()
+        # Let the worker deliver multiple frames to trigger FPS calculation
+        process_events_until(qapp, lambda: len(gui_window._frame_periods) >= 15)
         
         # The FPS should be calculated and updated
         # Since we're mocking, we can't guarantee the exact value, but we can check the method was called
@@ -1,7 +1,11 @@
 import pytest
 import tempfile
+import copy
 import csv
+import dataclasses
 import os
+import pickle
+from unittest.mock import patch
 from ultra_app.interface_adapters.measurement_loader import MeasurementLoader
 from ultra_app.domain.entities import Measurement
 
@@ -30,6 +34,25 @@ class TestMeasurementLoaderIntegration:
         finally:
             os.unlink(csv_path)
     
+    def test_raw_row_kept_only_on_request(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            writer = csv.writer(f)
+            writer.writerow(['image_stem', 'ONSDmm', 'note'])
+            writer.writerow(['01_16', '2.37', 'ok'])
+            csv_path = f.name
+        
+        try:
+            default = MeasurementLoader(csv_path).load_measurements()
+            assert default[0].raw == {}
+            assert default[0].as_dict()['onsd_mm'] == 2.37
+            
+            kept = MeasurementLoader(csv_path).load_measurements(keep_raw=True)
+            assert kept[0].raw == {'image_stem': '01_16', 'ONSDmm': '2.37', 'note': 'ok'}
+            assert kept[0].as_dict()['note'] == 'ok'
+        
+        finally:
+            os.unlink(csv_path)
+    
     def test_load_patient_report_integration(self):
         with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
             writer = csv.writer(f)
@@ -53,4 +76,125 @@ class TestMeasurementLoaderIntegration:
             assert report.left_eye.average_onsd_mm == pytest.approx((4.92 + 4.92 + 2.31) / 3, 0.01)
         
         finally:
-            os.unlink(csv_path)
\ No newline at end of file
+            os.unlink(csv_path)
+
+    def test_column_resolution_is_cached_per_header(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            writer = csv.writer(f)
+            writer.writerow(['Image Stem', 'ONSD mm', 'Time'])
+            writer.writerow(['01_16', '2.37', '12:00:00'])
+            csv_path = f.name
+
+        try:
+            first = MeasurementLoader(csv_path)
+            first.load_measurements()
+            second = MeasurementLoader(csv_path)
+            second.load_measurements()
+
+            assert [name for name, _, _ in first.columns] == ['image_stem', 'onsd_mm', 'time']
+            assert second.columns is first.columns
+        
+        finally:
+            os.unlink(csv_path)
+
+    def test_short_rows_and_missing_columns_load_as_none(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as f:
+            f.write("image_stem,ONSDmm,ONDmm\n01_16,2.37,1.2\n\n01_17,bad\n01_18\n")
+            csv_path = f.name
+
+        try:
+            loaded = MeasurementLoader(csv_path).load_measurements(keep_raw=True)
+
+            assert [m.image_stem for m in loaded] == ['01_16', '01_17', '01_18']
+            assert [m.onsd_mm for m in loaded] == [2.37, None, None]
+            assert [m.ond_mm for m in loaded] == [1.2, None, None]
+            assert all(m.depth_mm is None and m.status is None for m in loaded)
+            assert loaded[2].raw == {'image_stem': '01_18', 'ONSDmm': None, 'ONDmm': None}
+        
+        finally:
+            os.unlink(csv_path)
+
+    def test_max_rows_stops_reading_early(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as f:
+            f.write("image_stem,ONSDmm\n\n01_16,2.37\n01_17,2.19\n01_18,4.92\n01_19,4.92\n")
+            csv_path = f.name
+
+        parsed = []
+        real_reader = csv.reader
+
+        def counting_reader(fh):
+            for row in real_reader(fh):
+                parsed.append(row)
+                yield row
+
+        try:
+            with patch("ultra_app.interface_adapters.measurement_loader.csv.reader", counting_reader):
+                loaded = MeasurementLoader(csv_path).load_measurements(max_rows=2)
+
+            assert [m.image_stem for m in loaded] == ['01_16', '01_17']
+            assert len(parsed) == 4  # header, blank line, two data rows
+        
+        finally:
+            os.unlink(csv_path)
+
+    def test_unchanged_csv_is_parsed_once(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as f:
+            f.write("image_stem,ONSDmm\n01_16,2.37\n")
+            csv_path = f.name
+
+        parses = []
+        real_reader = csv.reader
+
+        def counting_reader(fh):
+            parses.append(fh.name)
+            return real_reader(fh)
+
+        try:
+            with patch("ultra_app.interface_adapters.measurement_loader.csv.reader", counting_reader):
+                first = MeasurementLoader(csv_path).load_measurements()
+                again = MeasurementLoader(csv_path).load_measurements()
+                assert len(parses) == 1
+                assert again == first and again is not first
+
+                with open(csv_path, 'w', newline='') as f:
+                    f.write("image_stem,ONSDmm\n01_16,2.37\n01_17,2.19\n")
+                changed = MeasurementLoader(csv_path).load_measurements()
+
+            assert len(parses) == 2
+            assert [m.onsd_mm for m in changed] == [2.37, 2.19]
+        
+        finally:
+            os.unlink(csv_path)
+
+    def test_cached_rows_are_not_shared_between_calls(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as f:
+            f.write("image_stem,ONSDmm\n01_16,2.37\n")
+            csv_path = f.name
+
+        try:
+            first = MeasurementLoader(csv_path).load_measurements(keep_raw=True)
+            first[0].onsd_mm = 9.9
+            first[0].raw['ONSDmm'] = '9.9'
+
+            again = MeasurementLoader(csv_path).load_measurements(keep_raw=True)
+            assert again[0].onsd_mm == 2.37
+            assert again[0].raw == {'image_stem': '01_16', 'ONSDmm': '2.37'}
+        
+        finally:
+            os.unlink(csv_path)
+
+    def test_loaded_rows_pickle_and_copy(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as f:
+            f.write("image_stem,ONSDmm\n01_16,2.37\n01_17,2.19\n")
+            csv_path = f.name
+
+        try:
+            first, second = MeasurementLoader(csv_path).load_measurements()
+
+            assert first.raw == {} and first.raw is not second.raw
+            assert pickle.loads(pickle.dumps(first)) == first
+            assert copy.deepcopy(first) == first
+            assert dataclasses.asdict(first)['onsd_mm'] == 2.37
+        
+        finally:
+            os.unlink(csv_path)
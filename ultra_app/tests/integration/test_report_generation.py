@@ -1,7 +1,13 @@
 import pytest
 import tempfile
 import os
+import cv2
 import numpy as np
+from io import BytesIO
+from unittest.mock import Mock, patch
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+from ultra_app.interface_adapters import report_writer
 from ultra_app.interface_adapters.report_writer import ReportWriter
 from ultra_app.domain.entities import ReportData, PatientReport, EyeMeasurements, Measurement
 
@@ -51,7 +57,8 @@ class TestReportWriterIntegration:
                 ond_px_values=[m.ond_px for m in measurements],
                 depth_values=[m.depth_mm for m in measurements],
                 latency_values=[m.latency_s for m in measurements],
-                status_values=[m.status for m in measurements]
+                status_values=[m.status for m in measurements],
+                formats=("pdf", "png"),
             )
             
             # Verify files were created
@@ -62,4 +69,193 @@ class TestReportWriterIntegration:
             
             # Verify file sizes are reasonable
             assert os.path.getsize(png_path) > 1000  # At least 1KB
-            assert os.path.getsize(pdf_path) > 1000  # At least 1KB
\ No newline at end of file
+            assert os.path.getsize(pdf_path) > 1000  # At least 1KB
+
+    def test_report_generation_with_opencv_jpeg_fallback(self, monkeypatch, frame_480p):
+        # simplejpeg is optional; without it thumbnails go through cv2.imencode
+        monkeypatch.setattr(report_writer, "simplejpeg", None)
+        images = [frame_480p] * 3
+
+        writer = ReportWriter(threshold_mm=6.0)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            png_path, pdf_path = writer.save_report(
+                images_right=images,
+                images_left=images[:1],
+                out_dir=temp_dir,
+                onsd_values=[2.37, 2.19, 4.92, None, None, None],
+                patient_id="FALLBACK_TEST",
+            )
+
+            assert os.path.getsize(pdf_path) > 1000
+            assert png_path is None  # PNG preview is opt-in
+            assert os.listdir(temp_dir) == [os.path.basename(pdf_path)]
+
+    def test_thumbnails_downscaled_before_encoding(self):
+        writer = ReportWriter()
+        big = np.random.randint(0, 255, (1080, 1920, 3), dtype=np.uint8)
+
+        reader = writer._np_to_imagereader(big, max_size=(600, 700))
+        assert reader.getSize() == (600, 338)  # aspect ratio kept
+
+        small = np.zeros((100, 80), dtype=np.uint8)
+        assert writer._np_to_imagereader(small, max_size=(600, 700)).getSize() == (80, 100)
+
+    def test_png_grid_fills_cells_in_place(self):
+        writer = ReportWriter()
+        color = np.full((480, 640, 3), 10, dtype=np.uint8)
+        gray = np.full((480, 640), 100, dtype=np.uint8)
+
+        grid = writer._build_png_grid([color, None, None], [gray])
+
+        assert grid.shape == (960, 480, 3)  # 3x2 cells of 240x320
+        assert (grid[:320, :240] == 10).all()
+        assert (grid[:320, 240:] == 100).all()
+        assert (grid[320:, :] == 240).all()  # empty slots stay placeholder gray
+
+    def test_placeholder_jpeg_encoded_once(self, monkeypatch):
+        monkeypatch.setattr(report_writer.os, "cpu_count", lambda: 8)  # threaded path
+        monkeypatch.setattr(ReportWriter, "_BLANK_JPEG", {})
+        writer = ReportWriter()
+        calls = []
+        encode = writer._encode_jpeg
+        monkeypatch.setattr(writer, "_encode_jpeg", lambda img: calls.append(img.shape) or encode(img))
+
+        readers = writer._encode_thumbs([None] * 6)
+
+        assert len(readers) == 6
+        assert calls == [(300, 225, 3)]
+
+    def test_warm_up_prepares_placeholder(self, monkeypatch):
+        monkeypatch.setattr(ReportWriter, "_BLANK_JPEG", {})
+        writer = ReportWriter(jpeg_quality=70)
+
+        writer.warm_up()
+
+        assert list(ReportWriter._BLANK_JPEG) == [70]
+
+    @pytest.mark.parametrize("use_simplejpeg", [True, False])
+    def test_grayscale_encoded_without_bgr_expansion(self, monkeypatch, use_simplejpeg):
+        if use_simplejpeg:
+            pytest.importorskip("simplejpeg")
+        else:
+            monkeypatch.setattr(report_writer, "simplejpeg", None)
+        gray = np.random.randint(0, 255, (120, 160), dtype=np.uint8)
+
+        data = ReportWriter()._encode_jpeg(gray)
+
+        assert cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED).ndim == 2
+
+    def test_parallel_thumbnail_encode_keeps_order(self, monkeypatch):
+        monkeypatch.setattr(report_writer.os, "cpu_count", lambda: 4)
+        imgs = [np.full((60, 80, 3), v, dtype=np.uint8) for v in (0, 50, 100)] + [None]
+
+        readers = ReportWriter()._encode_thumbs(imgs)
+
+        assert [r.getSize() for r in readers] == [(80, 60)] * 3 + [(225, 300)]
+        means = [np.frombuffer(r.getRGBData(), np.uint8).mean() for r in readers[:3]]
+        assert means == sorted(means)
+
+    def test_pdf_embeds_thumbnails_as_binary_jpeg(self, frame_480p):
+        images = [frame_480p] * 3
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _, pdf_path = ReportWriter().save_report(images, images, temp_dir)
+            with open(pdf_path, "rb") as f:
+                data = f.read()
+
+        assert b"/DCTDecode" in data
+        assert b"/ASCII85Decode" not in data
+
+    def test_ascii85_setting_restored_after_save(self, frame_480p):
+        from reportlab import rl_config
+        before = rl_config.useA85
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ReportWriter().save_report([frame_480p], [], temp_dir)
+
+        assert rl_config.useA85 == before
+
+    def test_table_drawn_as_single_text_object(self):
+        rows = [(str(i + 1), "R", "ok", "2.50", "3.10", "120", "15.00", "12:00:00") for i in range(6)]
+        c = canvas.Canvas(BytesIO())
+
+        with patch.object(c, "drawString") as draw_string, \
+                patch.object(c, "drawText", wraps=c.drawText) as draw_text:
+            y = ReportWriter()._draw_enhanced_table_and_return_y(c, start_x=0, start_y=500, rows=rows)
+
+        draw_string.assert_not_called()
+        draw_text.assert_called_once()
+        assert y == pytest.approx(500 - 7 * 5 * mm)
+
+    def test_accepts_frame_arrays(self, sample_operation_state, frame_480p):
+        state = sample_operation_state
+        for _ in range(3):
+            state.images_right.append(frame_480p)
+        state.images_left.append(frame_480p)  # left eye partly captured
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            preview_path, pdf_path = ReportWriter().save_report(
+                state.frames[:3], state.frames[3:], temp_dir, formats=("pdf", "png"),
+            )
+
+            assert os.path.getsize(pdf_path) > 1000
+            assert cv2.imread(preview_path).shape == (960, 480, 3)
+
+    def test_preview_grid_as_jpeg(self, frame_480p):
+        images = [frame_480p] * 3
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            preview_path, _ = ReportWriter().save_report(
+                images, images, temp_dir, formats=("pdf", "jpg"),
+            )
+
+            assert preview_path.endswith(".jpg")
+            assert cv2.imread(preview_path).shape == (960, 480, 3)
+
+        for bad in [("bmp",), ("png", "jpg"), ()]:
+            with pytest.raises(ValueError):
+                ReportWriter().save_report(images, images, "unused", formats=bad)
+
+    def test_preview_only_skips_pdf(self, frame_480p):
+        images = [frame_480p] * 3
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch.object(ReportWriter, "_build_pdf_single_page") as build_pdf:
+                preview_path, pdf_path = ReportWriter().save_report(
+                    images, images, temp_dir, formats=("png",),
+                )
+
+            build_pdf.assert_not_called()
+            assert pdf_path is None
+            assert os.listdir(temp_dir) == [os.path.basename(preview_path)]
+
+    def test_report_timestamp_taken_once(self, monkeypatch):
+        from datetime import datetime
+        fixed = datetime(2025, 12, 31, 23, 59, 59)
+        clock = Mock()
+        clock.now.return_value = fixed
+        monkeypatch.setattr(report_writer, "datetime", clock)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _, pdf_path = ReportWriter().save_report([], [], temp_dir)
+
+        clock.now.assert_called_once()
+        assert os.path.basename(pdf_path) == "report_20251231_235959.pdf"
+
+    def test_table_cells_formatted_with_placeholders(self):
+        with patch.object(ReportWriter, "_draw_enhanced_table_and_return_y", return_value=500) as draw, \
+                tempfile.TemporaryDirectory() as temp_dir:
+            ReportWriter().save_report(
+                [], [], temp_dir,
+                onsd_values=[2.375, None, 3],
+                ond_values=[1.2],
+                onsd_px_values=[79.0],
+                status_values=["meas_ok"],
+                capture_times=["12:00:00"],
+            )
+
+        rows = draw.call_args.kwargs["rows"]
+        assert rows[0] == ("1", "R", "meas_ok", "2.38", "1.20", "79", "—", "12:00:00")
+        assert rows[2] == ("3", "R", "—", "3.00", "—", "—", "—", "—")
+        assert rows[5] == ("6", "L", "—", "—", "—", "—", "—", "—")
@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+from ultra_app.interface_adapters import camera_opencv
+from ultra_app.interface_adapters.camera_opencv import OpenCVCamera
+
+
+class FakeCapture:
+    def __init__(self, opened: bool):
+        self.opened = opened
+        self.released = False
+
+    def set(self, prop, value):
+        return True
+
+    def isOpened(self):
+        return self.opened
+
+    def grab(self):
+        return True
+
+    def retrieve(self):
+        return True, np.zeros((2, 2, 3), dtype=np.uint8)
+
+    def release(self):
+        self.released = True
+
+
+@pytest.fixture
+def captures(monkeypatch):
+    """Open results for successive cv2.VideoCapture() calls; the created fakes are recorded."""
+    opened, created = [], []
+
+    def video_capture(index):
+        created.append(FakeCapture(opened.pop(0)))
+        return created[-1]
+
+    monkeypatch.setattr(camera_opencv.cv2, "VideoCapture", video_capture)
+    return opened, created
+
+
+class TestOpenCVCamera:
+    def test_pause_releases_and_resume_reopens(self, captures):
+        opened, created = captures
+        opened += [True, True]
+        camera = OpenCVCamera()
+
+        camera.pause()
+        assert created[0].released
+        assert camera.read() is None
+
+        camera.resume()
+        assert camera.cap is created[1]
+        assert camera.read() is not None
+
+    def test_failed_reopen_is_retried_on_read(self, captures):
+        opened, created = captures
+        opened += [True, False, False, True]
+        camera = OpenCVCamera()
+        camera.pause()
+
+        with pytest.raises(RuntimeError):
+            camera.resume()
+        assert camera.read() is None  # second reopen attempt fails too
+        frame = camera.read()  # third attempt opens the device
+
+        assert frame is not None
+        assert camera.cap is created[3]
+        assert len(created) == 4
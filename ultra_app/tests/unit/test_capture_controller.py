@@ -56,12 +56,12 @@ class TestCaptureController:
         controller.state.cursor = 6
         assert controller.next_expected_label() == "Completed"
     
-    def test_process_only(self, mock_processor):
+    def test_process_only(self, mock_processor, frame_480p):
         policy = SixImagesPolicy()
         controller = CaptureController(mock_processor, policy)
         
-        input_frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
-        processed_frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+        input_frame = frame_480p
+        processed_frame = np.full_like(frame_480p, 7)
         mock_processor.process.return_value = processed_frame
         
         result = controller.process_only(input_frame)
@@ -71,12 +71,12 @@ class TestCaptureController:
         # State should not be modified
         assert controller.state.cursor == 0
     
-    def test_capture(self, mock_processor):
+    def test_capture(self, mock_processor, frame_480p):
         policy = SixImagesPolicy()
         controller = CaptureController(mock_processor, policy)
         
-        input_frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
-        processed_frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+        input_frame = frame_480p
+        processed_frame = np.full_like(frame_480p, 7)
         mock_processor.process.return_value = processed_frame
         
         controller.capture(input_frame)
@@ -86,22 +86,37 @@ class TestCaptureController:
         assert len(controller.state.images_right) == 1
         assert np.array_equal(controller.state.images_right[0], processed_frame)
     
-    def test_capture_when_complete(self, mock_processor):
+    def test_capture_when_complete(self, mock_processor, frame_480p):
         policy = SixImagesPolicy()
         controller = CaptureController(mock_processor, policy)
         controller.state.cursor = 6  # Mark as complete
         
-        input_frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+        input_frame = frame_480p
         
         with pytest.raises(RuntimeError, match="All 6 images already captured"):
             controller.capture(input_frame)
     
-    def test_undo(self, mock_processor):
+    def test_capture_precomputed(self, mock_processor, frame_480p):
+        policy = SixImagesPolicy()
+        controller = CaptureController(mock_processor, policy)
+        
+        processed_frame = np.full_like(frame_480p, 7)
+        controller.capture_precomputed(processed_frame)
+        
+        mock_processor.process.assert_not_called()
+        assert controller.state.cursor == 1
+        assert np.array_equal(controller.state.images_right[0], processed_frame)
+        
+        controller.state.cursor = 6
+        with pytest.raises(RuntimeError, match="All 6 images already captured"):
+            controller.capture_precomputed(processed_frame)
+    
+    def test_undo(self, mock_processor, frame_480p):
         policy = SixImagesPolicy()
         controller = CaptureController(mock_processor, policy)
         
         # Capture one image
-        input_frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+        input_frame = frame_480p
         mock_processor.process.return_value = input_frame
         controller.capture(input_frame)
         
@@ -122,12 +137,12 @@ class TestCaptureController:
         controller.undo()
         assert controller.state.cursor == 0
     
-    def test_reset(self, mock_processor):
+    def test_reset(self, mock_processor, frame_480p):
         policy = SixImagesPolicy()
         controller = CaptureController(mock_processor, policy)
         
         # Capture some images
-        input_frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+        input_frame = frame_480p
         mock_processor.process.return_value = input_frame
         controller.capture(input_frame)
         controller.capture(input_frame)
@@ -1,7 +1,10 @@
 import pytest
 import numpy as np
 from datetime import datetime
-from ultra_app.domain.entities import CaptureSlot, OperationState, Measurement, EyeMeasurements, PatientReport
+from ultra_app.domain.entities import (
+    CaptureSlot, OperationState, Measurement, EyeMeasurements, PatientReport, FrameStack, ReportData, pad_list,
+    float_values, nanmean_rounded,
+)
 
 
 class TestCaptureSlot:
@@ -15,6 +18,66 @@ class TestCaptureSlot:
         with pytest.raises(AttributeError):
             slot.eye = "Right"
 
+    def test_capture_slot_has_no_instance_dict(self):
+        assert not hasattr(CaptureSlot("Right", 1), "__dict__")
+
+
+class TestFrameStack:
+    def test_append_copies_into_single_buffer(self):
+        stack = FrameStack(3)
+        frames = [np.full((4, 5, 3), i, dtype=np.uint8) for i in range(3)]
+        for f in frames:
+            stack.append(f)
+
+        assert len(stack) == 3
+        view = stack.view()
+        assert view.shape == (3, 4, 5, 3)
+        assert view.flags.c_contiguous
+        assert stack[0].base is stack[2].base  # views into the same slab
+        assert all(np.array_equal(a, b) for a, b in zip(stack, frames))
+
+    def test_pop(self):
+        stack = FrameStack(2)
+        stack.append(np.ones((2, 2, 3), dtype=np.uint8))
+        popped = stack.pop()
+        assert len(stack) == 0
+        assert popped.shape == (2, 2, 3)
+        with pytest.raises(IndexError):
+            stack.pop()
+
+    def test_delete_last_frame(self):
+        stack = FrameStack(2)
+        stack.append(np.zeros((2, 2, 3), dtype=np.uint8))
+        stack.append(np.ones((2, 2, 3), dtype=np.uint8))
+        with pytest.raises(IndexError):
+            del stack[0]
+        del stack[-1]
+        assert len(stack) == 1
+        del stack[0]  # now the last one
+        assert len(stack) == 0
+        with pytest.raises(IndexError):
+            del stack[-1]
+
+    def test_capacity_and_shape_checks(self):
+        stack = FrameStack(1)
+        stack.append(np.zeros((2, 2, 3), dtype=np.uint8))
+        with pytest.raises(IndexError):
+            stack.append(np.zeros((2, 2, 3), dtype=np.uint8))
+
+        stack = FrameStack(2)
+        stack.append(np.zeros((2, 2, 3), dtype=np.uint8))
+        with pytest.raises(ValueError):
+            stack.append(np.zeros((3, 3, 3), dtype=np.uint8))
+
+    def test_shape_change_after_undo(self):
+        # e.g. the camera reopened at another resolution once the only capture was undone
+        stack = FrameStack(2)
+        stack.append(np.zeros((2, 2, 3), dtype=np.uint8))
+        del stack[-1]
+        stack.append(np.ones((3, 4, 3), dtype=np.uint8))
+        assert stack.view().shape == (1, 3, 4, 3)
+        assert (stack[0] == 1).all()
+
 
 class TestOperationState:
     def test_operation_state_initialization(self, sample_capture_slots):
@@ -49,6 +112,35 @@ class TestOperationState:
         state.advance()
         assert state.cursor == initial_cursor + 1
 
+    def test_stack_at_follows_capture_order(self, sample_operation_state):
+        state = sample_operation_state
+        assert state.eye_side == (0, 0, 0, 1, 1, 1)
+        assert state.stack_at(2) is state.images_right
+        assert state.stack_at(3) is state.images_left
+
+    def test_eyes_share_one_frame_slab(self, sample_operation_state):
+        state = sample_operation_state
+        assert state.frames.shape == (0,)
+        frames = [np.full((4, 5, 3), i, dtype=np.uint8) for i in range(4)]
+        for f in frames[:3]:
+            state.images_right.append(f)
+        state.images_left.append(frames[3])
+
+        assert len(state.images_right) == 3 and len(state.images_left) == 1
+        assert state.frames.shape == (4, 4, 5, 3)
+        assert np.shares_memory(state.frames, state.images_right.view())
+        assert np.shares_memory(state.frames, state.images_left.view())
+        assert all(np.array_equal(a, b) for a, b in zip(state.frames, frames))
+
+    def test_shared_slab_reshapes_only_when_both_eyes_are_empty(self, sample_operation_state):
+        state = sample_operation_state
+        state.images_right.append(np.zeros((4, 5, 3), dtype=np.uint8))
+        with pytest.raises(ValueError):
+            state.images_left.append(np.zeros((6, 8, 3), dtype=np.uint8))
+        del state.images_right[-1]
+        state.images_left.append(np.zeros((6, 8, 3), dtype=np.uint8))
+        assert state.frames.shape == (1, 6, 8, 3)
+
 
 class TestMeasurement:
     def test_measurement_creation(self):
@@ -95,6 +187,19 @@ class TestEyeMeasurements:
         eye_measurements = EyeMeasurements(measurements=measurements)
         assert eye_measurements.average_onsd_mm is None
 
+    def test_average_ond_mm_with_none(self):
+        measurements = [Measurement(ond_mm=1.0), Measurement(ond_mm=None), Measurement(ond_mm=2.0)]
+        eye_measurements = EyeMeasurements(measurements=measurements)
+        assert eye_measurements.average_ond_mm == pytest.approx(1.5, 0.01)
+        assert EyeMeasurements().average_ond_mm is None
+
+    def test_value_columns_built_once(self):
+        eye_measurements = EyeMeasurements(measurements=[Measurement(onsd_mm=2.5), Measurement()])
+        arr = eye_measurements.onsd_array
+        assert arr is eye_measurements.onsd_array
+        assert np.isnan(arr[1]) and not arr.flags.writeable
+        assert eye_measurements == EyeMeasurements(measurements=eye_measurements.measurements)
+
 
 class TestPatientReport:
     def test_patient_report_creation(self, sample_patient_report):
@@ -108,11 +213,23 @@ class TestPatientReport:
         assert all_measurements[0].onsd_mm == 2.37  # First right eye
         assert all_measurements[3].onsd_mm == 4.92  # First left eye
     
+    def test_derived_lists_computed_once(self, sample_patient_report):
+        assert sample_patient_report.all_measurements is sample_patient_report.all_measurements
+        assert sample_patient_report.onsd_values is sample_patient_report.onsd_values
+    
     def test_onsd_values(self, sample_patient_report):
         onsd_values = sample_patient_report.onsd_values
         expected = [2.37, 2.19, 4.92, 4.92, 4.92, 2.31]
         assert onsd_values == expected
     
+    def test_value_arrays_match_lists(self, sample_patient_report):
+        report = sample_patient_report
+        expected = np.array([np.nan if v is None else v for v in report.onsd_values])
+        np.testing.assert_array_equal(report.onsd_array, expected)
+        assert report.ond_array.shape == (len(report.ond_values),)
+        assert report.onsd_array is report.onsd_array
+        assert not report.onsd_array.flags.writeable
+
     def test_capture_times(self):
         measurements = [
             Measurement(time="12:00:00"),
@@ -124,4 +241,27 @@ class TestPatientReport:
         report = PatientReport(patient_id="TEST", right_eye=right_eye, left_eye=left_eye)
         
         capture_times = report.capture_times
-        assert capture_times == ["12:00:00", "—", "12:01:00", "12:00:00", "—", "12:01:00"]
\ No newline at end of file
+        assert capture_times == ["12:00:00", "—", "12:01:00", "12:00:00", "—", "12:01:00"]
+
+
+class TestPadding:
+    def test_pad_list(self):
+        assert pad_list([1, 2], 3) == [1, 2, None]
+        assert pad_list([1, 2, 3, 4], 3) == [1, 2, 3]
+        padded = pad_list([], 2, Measurement)
+        assert padded[0] is not padded[1]
+    
+    def test_report_data_pads_images_per_eye(self, sample_patient_report):
+        img = np.zeros((4, 4, 3), dtype=np.uint8)
+        data = ReportData(patient_report=sample_patient_report, right_images=[img], left_images=[img] * 4)
+        assert len(data.all_images) == 6
+        assert data.right_images[1:] == [None, None]
+        assert not hasattr(data, "__dict__")
+
+
+class TestValueHelpers:
+    def test_averages_ignore_missing_values(self):
+        onsd = float_values([2.4, None, "n/a", 2.6], length=6)
+
+        assert nanmean_rounded(onsd[:4]) == 2.5
+        assert nanmean_rounded(onsd[4:]) is None
@@ -33,7 +33,7 @@ class TestExportReport:
                 exporter.export(state, temp_dir)
     
     @patch('ultra_app.use_cases.export_report.MeasurementLoader')
-    def test_export_with_csv_measurements_success(self, mock_loader_class, mock_report_writer):
+    def test_export_with_csv_measurements_success(self, mock_loader_class, mock_report_writer, frame_480p):
         # Setup mocks
         mock_loader = Mock()
         mock_loader_class.return_value = mock_loader
@@ -71,8 +71,8 @@ class TestExportReport:
 
         with tempfile.TemporaryDirectory() as temp_dir:
             # Create test captured images
-            captured_images_right = [np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(3)]
-            captured_images_left = [np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(3)]
+            captured_images_right = [frame_480p] * 3
+            captured_images_left = [frame_480p] * 3
 
             png_path, pdf_path = exporter.export_with_csv_measurements(
                 images_right=captured_images_right,
@@ -87,7 +87,7 @@ class TestExportReport:
             assert pdf_path == "test_report.pdf"
     
     @patch('ultra_app.use_cases.export_report.MeasurementLoader')
-    def test_export_with_csv_measurements_empty_csv(self, mock_loader_class, mock_report_writer):
+    def test_export_with_csv_measurements_empty_csv(self, mock_loader_class, mock_report_writer, frame_480p):
         """Test that empty CSV files are handled gracefully"""
         # Setup mocks
         mock_loader = Mock()
@@ -100,8 +100,8 @@ class TestExportReport:
 
         with tempfile.TemporaryDirectory() as temp_dir:
             # Create test captured images
-            captured_images_right = [np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(3)]
-            captured_images_left = [np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(3)]
+            captured_images_right = [frame_480p] * 3
+            captured_images_left = [frame_480p] * 3
 
             png_path, pdf_path = exporter.export_with_csv_measurements(
                 images_right=captured_images_right,
@@ -114,4 +114,21 @@ class TestExportReport:
             # Should still call save_report but with None values
             mock_report_writer.save_report.assert_called_once()
             assert png_path == "test_report.png"
-            assert pdf_path == "test_report.pdf"
\ No newline at end of file
+            assert pdf_path == "test_report.pdf"
+
+    @patch('ultra_app.use_cases.export_report.MeasurementLoader')
+    def test_export_with_csv_measurements_passes_nan_padded_columns(self, mock_loader_class, mock_report_writer):
+        mock_loader_class.return_value.load_measurements.return_value = [
+            Measurement(onsd_mm=2.37, status="meas_ok"),
+            Measurement(onsd_mm=None, status="meas_ok"),
+        ]
+
+        ExportReport(mock_report_writer).export_with_csv_measurements(
+            images_right=[], images_left=[], measurements_csv="dummy.csv", out_dir="out",
+        )
+
+        kwargs = mock_report_writer.save_report.call_args.kwargs
+        onsd = kwargs["onsd_values"]
+        assert onsd.dtype == np.float64 and onsd.shape == (6,)
+        assert onsd[0] == 2.37 and np.isnan(onsd[1:]).all()
+        assert kwargs["status_values"] == ["meas_ok", "meas_ok", None, None, None, None]
@@ -21,10 +21,10 @@ class TestSixImagesPolicy:
             assert order[i].eye == "Left"
             assert order[i].index_in_eye == i - 2
     
-    def test_store_image_right_eye(self, sample_operation_state):
+    def test_store_image_right_eye(self, sample_operation_state, frame_480p):
         policy = SixImagesPolicy()
         state = sample_operation_state
-        processed_image = np.random.randint(0, 255, (100, 100, 3), dtype=np.uint8)
+        processed_image = frame_480p
         
         # First slot is Right eye
         policy.store_image(state, processed_image)
@@ -34,10 +34,10 @@ class TestSixImagesPolicy:
         assert state.cursor == 1
         assert np.array_equal(state.images_right[0], processed_image)
     
-    def test_store_image_left_eye(self, sample_operation_state):
+    def test_store_image_left_eye(self, sample_operation_state, frame_480p):
         policy = SixImagesPolicy()
         state = sample_operation_state
-        processed_image = np.random.randint(0, 255, (100, 100, 3), dtype=np.uint8)
+        processed_image = frame_480p
         
         # Move to left eye slots
         state.cursor = 3
@@ -47,4 +47,16 @@ class TestSixImagesPolicy:
         assert len(state.images_right) == 0
         assert len(state.images_left) == 1
         assert state.cursor == 4
-        assert np.array_equal(state.images_left[0], processed_image)
\ No newline at end of file
+        assert np.array_equal(state.images_left[0], processed_image)
+
+    def test_store_image_keeps_frames_contiguous_uint8(self, sample_operation_state, frame_480p):
+        policy = SixImagesPolicy()
+        state = sample_operation_state
+        mirrored = frame_480p[:, ::-1]  # non-contiguous view
+
+        policy.store_image(state, mirrored)
+
+        stored = state.images_right[0]
+        assert stored.dtype == np.uint8
+        assert stored.flags.c_contiguous
+        assert np.array_equal(stored, mirrored)
@@ -14,6 +14,8 @@ class CaptureController:
         self.processor = processor
         self.policy = policy
         self.state = OperationState(order=self.policy.initial_order())
+        # "Right #1" ... "Left #3", then "Completed"; indexed by cursor (reset() keeps the order)
+        self._labels = tuple(f"{s.eye} #{s.index_in_eye}" for s in self.state.order) + ("Completed",)
 
     # ---- Queries (for GUI) ----
     def progress_vector(self) -> Tuple[int, int]:
@@ -22,13 +24,11 @@ class CaptureController:
         return cur, self.state.total
 
     def is_complete(self) -> bool:
-        return self.state.is_complete()
+        # polled per preview frame: compare the ints rather than call through the state
+        return self.state.cursor >= self.state.total
 
     def next_expected_label(self) -> str:
-        if self.state.is_complete():
-            return "Completed"
-        slot = self.state.current_slot()
-        return f"{slot.eye} #{slot.index_in_eye}"
+        return self._labels[min(self.state.cursor, self.state.total)]
 
     def process_only(self, frame: np.ndarray) -> np.ndarray:
         """Return processed preview without mutating state."""
@@ -36,21 +36,25 @@ class CaptureController:
 
     # ---- Commands ----
     def capture(self, frame: np.ndarray) -> None:
-        if self.state.is_complete():
+        if self.state.cursor >= self.state.total:
             raise RuntimeError("All 6 images already captured.")
         processed = self.processor.process(frame)
         self.policy.store_image(self.state, processed)
 
+    def capture_precomputed(self, processed: np.ndarray) -> None:
+        """Commit an already processed image (e.g. the one shown for review) without re-processing."""
+        if self.state.cursor >= self.state.total:
+            raise RuntimeError("All 6 images already captured.")
+        self.policy.store_image(self.state, processed)
+
     def undo(self) -> None:
         if self.state.cursor == 0:
             return
-        # Move cursor back, then pop from the appropriate list
+        # Move cursor back, then drop the last frame of that slot's eye
         self.state.cursor -= 1
-        slot = self.state.order[self.state.cursor]
-        if slot.eye == "Right" and self.state.images_right:
-            self.state.images_right.pop()
-        elif slot.eye == "Left" and self.state.images_left:
-            self.state.images_left.pop()
+        stack = self.state.stack_at(self.state.cursor)
+        if stack:
+            del stack[-1]
 
     def reset(self) -> None:
         self.state = OperationState(order=self.policy.initial_order())
@@ -1,12 +1,17 @@
 # ultra_app/use_cases/export_report.py
 from __future__ import annotations
 
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Sequence
 
-from ultra_app.domain.entities import OperationState
+import numpy as np
+
+from ultra_app.domain.entities import OperationState, float_column, pad_list
 from ultra_app.domain.ports import ReportWriterPort
 from ultra_app.interface_adapters.measurement_loader import MeasurementLoader
 
+# used when the GUI supplies fewer than six capture times
+_DEFAULT_CAPTURE_TIMES = ("12:00:00", "12:01:00", "12:02:00", "12:03:00", "12:04:00", "12:05:00")
+
 
 class ExportReport:
     """
@@ -21,22 +26,26 @@ class ExportReport:
             self,
             state: OperationState,
             out_dir: str,
-            onsd_values: Optional[List[Optional[float]]] = None,
+            onsd_values: Optional[Sequence[Optional[float]]] = None,
             capture_times: Optional[List[str]] = None,
             patient_id: Optional[str] = None,
-    ) -> Tuple[str, str]:
+            formats: Sequence[str] = ("pdf",),
+    ) -> Tuple[Optional[str], Optional[str]]:
         """
-        Returns (png_path, pdf_path).
+        Returns (png_path, pdf_path); a path is None when its format isn't in formats
+        ("pdf" and/or one preview grid type, "png" or "jpg").
+        onsd_values may be a list or a float array; None and NaN both mean "missing".
         Uses captured images from screen but measurement values from CSV.
         """
         if not state.is_complete():
             raise RuntimeError("Capture all 6 images before exporting.")
 
-        if onsd_values is None and hasattr(state, "onsd_values"):
-            onsd_values = getattr(state, "onsd_values")
-        if capture_times is None and hasattr(state, "capture_times"):
-            capture_times = getattr(state, "capture_times")
+        if onsd_values is None:
+            onsd_values = getattr(state, "onsd_values", None)
+        if capture_times is None:
+            capture_times = getattr(state, "capture_times", None)
 
+        # the state's frame stacks are views into one slab; hand them over as-is
         return self.writer.save_report(
             images_right=state.images_right,
             images_left=state.images_left,
@@ -44,20 +53,23 @@ class ExportReport:
             onsd_values=onsd_values,
             capture_times=capture_times,
             patient_id=patient_id,
+            formats=formats,
         )
 
     def export_with_csv_measurements(
             self,
-            images_right: List,
-            images_left: List,
+            images_right: Sequence[np.ndarray],
+            images_left: Sequence[np.ndarray],
             measurements_csv: str,
             out_dir: str,
             patient_id: Optional[str] = None,
             capture_times: Optional[List[str]] = None,
             debug: bool = False,
-    ) -> Tuple[str, str]:
+            formats: Sequence[str] = ("pdf",),
+    ) -> Tuple[Optional[str], Optional[str]]:
         """Generate a report using captured images but measurement values from CSV.
         ALWAYS uses provided capture times instead of CSV times.
+        Images may be lists, FrameStacks or (n, H, W, C) arrays; they are passed on uncopied.
         """
         # load up to 6 measurement rows from CSV
         loader = MeasurementLoader(measurements_csv)
@@ -68,39 +80,25 @@ class ExportReport:
             for i, m in enumerate(measurements, 1):
                 print(f"  {i}: image_stem={m.image_stem!r}, onsd_mm={m.onsd_mm!r}")
 
-        # Extract all measurement data for the report from CSV (EXCEPT TIMES)
-        onsd_values = [m.onsd_mm for m in measurements]
-        ond_values = [m.ond_mm for m in measurements]
-        onsd_px_values = [m.onsd_px for m in measurements]
-        ond_px_values = [m.ond_px for m in measurements]
-        depth_values = [m.depth_mm for m in measurements]
-        latency_values = [m.latency_s for m in measurements]
-        status_values = [m.status for m in measurements]
+        # Extract all measurement data for the report from CSV (EXCEPT TIMES):
+        # numeric fields as float64 columns NaN-padded to 6 entries
+        onsd_values = float_column(measurements, "onsd_mm", 6)
+        ond_values = float_column(measurements, "ond_mm", 6)
+        onsd_px_values = float_column(measurements, "onsd_px", 6)
+        ond_px_values = float_column(measurements, "ond_px", 6)
+        depth_values = float_column(measurements, "depth_mm", 6)
+        latency_values = float_column(measurements, "latency_s", 6)
+        status_values = pad_list([m.status for m in measurements], 6)
 
         # ALWAYS USE PROVIDED CAPTURE TIMES OR DEFAULT
         if capture_times and len(capture_times) >= 6:
             final_capture_times = capture_times[:6]
         else:
-            # Create default times if none provided
-            final_capture_times = [f"12:0{i}:00" for i in range(6)]
-
-        # Pad lists to ensure we have 6 entries
-        while len(onsd_values) < 6:
-            onsd_values.append(None)
-        while len(ond_values) < 6:
-            ond_values.append(None)
-        while len(onsd_px_values) < 6:
-            onsd_px_values.append(None)
-        while len(ond_px_values) < 6:
-            ond_px_values.append(None)
-        while len(depth_values) < 6:
-            depth_values.append(None)
-        while len(latency_values) < 6:
-            latency_values.append(None)
-        while len(status_values) < 6:
-            status_values.append(None)
-        while len(final_capture_times) < 6:
-            final_capture_times.append("—")
+            # Default times if none provided (pad_list below makes the list copy)
+            final_capture_times = _DEFAULT_CAPTURE_TIMES
+
+        # Pad times to ensure we have 6 entries
+        final_capture_times = pad_list(final_capture_times, 6, lambda: "—")
 
         return self.writer.save_report(
             images_right=images_right,
@@ -115,4 +113,5 @@ class ExportReport:
             depth_values=depth_values,
             latency_values=latency_values,
             status_values=status_values,
+            formats=formats,
         )
\ No newline at end of file